@@ -0,0 +1,21 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+可选的numba JIT编译装饰器
+安装了numba时使用 numba.njit 把数值计算函数编译为机器码；
+未安装时退化为不做任何处理的装饰器，函数按普通Python代码执行，结果一致
+"""
+
+try:
+    from numba import njit
+except ImportError:  # numba为可选依赖
+    def njit(*args, **kwargs):
+        """numba.njit 的空实现：同时支持 @njit 和 @njit(cache=True, ...) 两种写法"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+__all__ = ["njit"]
@@ -8,6 +8,10 @@ class MyAccount:
     基于天勤(TQSdk)的Account对象，但移除协程依赖，改为纯数据对象，风格更接近vn.py。
     """
 
+    __slots__ = ("gateway_name", "accountid", "vt_accountid", "currency",
+                 "balance", "available", "frozen", "close_profit", "position_profit",
+                 "commission", "risk_ratio", "pnl")
+
     def __init__(self, gateway_name: str = "", accountid: str = ""):
         """
         初始化账户对象。
@@ -61,7 +61,7 @@ class Config:
     # 自定义数据表网关名称
     GATEWAY_NAME: str = "TQSIM"
 
-    # 数据更新频率（秒）
+    # 数据更新频率（秒）：行情按此间隔合并后分发给策略
     DATA_UPDATE_INTERVAL: float = 0.1  # 100毫秒
 
     # 是否启用详细日志
@@ -151,6 +151,9 @@ class Config:
     # 心跳检测间隔（秒）
     HEARTBEAT_INTERVAL: int = 30
 
+    # 订单/成交分发队列长度（同步循环与策略分发之间的缓冲）
+    DISPATCH_QUEUE_SIZE: int = 256
+
     # =========================================================================
     # 9. 环境配置（直接在代码中定义）
     # =========================================================================
@@ -11,14 +11,37 @@
 
 import asyncio
 import logging
+import math
+import time
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from itertools import islice
+from typing import Dict, Any, Optional, List, Callable, Tuple
 
 from tqsdk import TqApi, TqAuth
-from tqsdk.objs import Account, Position, Order, Trade
+from tqsdk.objs import Account, Position, Order, Trade, Quote
 
 from config import CurrentConfig
-from trading_strategies import BaseTradingStrategy
+from order import MyOrder
+from trade import MyTrade
+from trading_strategies import BaseTradingStrategy, QUOTE_BOOK
+
+# 日志消息模板：使用%风格参数，日志级别未启用时不做格式化
+_MSG_CONNECT_FAILED = "连接天勤API失败: %s"
+_MSG_POS_INIT_OK = "自定义持仓表初始化成功: %d个持仓"
+_MSG_TQ_POS_MISSING = "天勤持仓对象不存在（合约: %s）"
+_MSG_IMPORT_FAILED = "导入自定义表类失败: %s"
+_MSG_INIT_TABLES_FAILED = "初始化自定义表时发生错误: %s"
+_MSG_POS_MISSING = "自定义持仓对象未初始化（键: %s），返回None"
+_MSG_STRATEGY_ADDED = "已添加策略: %s"
+_MSG_STRATEGY_REMOVED = "已移除策略: %s"
+_MSG_CLOSE_WARNING = "关闭API连接时发生警告: %s"
+_MSG_SYNC_FAILED = "同步自定义数据表时发生错误: %s"
+_MSG_DISPATCH_FAILED = "策略 %s 处理%s时出错: %s"
+_MSG_STRATEGY_START_FAILED = "策略 %s 启动失败: %s"
+_MSG_STRATEGY_STOP_FAILED = "策略 %s 停止失败: %s"
+_MSG_CLEANUP_DONE = "清理缓存: 移除%d个已结束订单, %d条成交记录"
+_MSG_ORDER_PLACED = "已提交委托: %s %s %s %d手 价格%s -> %s"
+_MSG_ORDER_NO_PRICE = "合约 %s 没有可用的最新价，无法确定限价单价格"
 
 
 class MyDataManager:
@@ -30,6 +53,8 @@ class MyDataManager:
     def __init__(self):
         self.config = CurrentConfig
         self.api: Optional[TqApi] = None
+        # api.close 是否为协程函数，connect 时探测一次
+        self._close_is_coro: bool = False
         self.is_connected: bool = False
         self.logger = self._setup_logger()
 
@@ -38,21 +63,52 @@ class MyDataManager:
         self.tq_positions: Dict[str, Position] = {}
         self.tq_orders: Dict[str, Order] = {}
         self.tq_trades: Dict[str, Trade] = {}
+        self.tq_quotes: Dict[str, Quote] = {}
+        # 各合约的(多头键, 空头键)，初始化时生成，同步时无需重复格式化
+        self._pos_keys: Dict[str, Tuple[str, str]] = {}
 
         # 自定义数据表对象 - 修复：确保正确初始化
         self.my_account = None
         self.my_positions: Dict[str, Any] = {}
         self.my_orders: Dict[str, Any] = {}
         self.my_trades: Dict[str, Any] = {}
+        # 活跃委托单，随订单状态变化维护，查询时无需扫描全部委托单
+        self._active_orders: Dict[str, MyOrder] = {}
+
+        self._last_cleanup_time: float = time.monotonic()
 
         # 状态跟踪
         self.update_count: int = 0
-        self.last_update_time: Optional[datetime] = None
+        # 同步循环中只记录单调时钟，需要时再换算为datetime（见 last_update_time）
+        self._last_update_mono: Optional[float] = None
+        self._wall_epoch: Tuple[float, float] = (time.time(), time.monotonic())
         self.error_count: int = 0
+        # 数据同步完成事件，在使用它的事件循环中延迟创建
+        self._update_event: Optional[asyncio.Event] = None
+        # _update_event 所绑定的事件循环：同一个数据管理器可能先后在多个事件循环中使用
+        self._update_event_loop: Optional[asyncio.AbstractEventLoop] = None
+        # 运行 start_data_sync 的任务，由 start_trading 启动，stop_trading/disconnect 时取消
+        self._sync_task: Optional[asyncio.Task] = None
 
         # 策略管理
         self.trading_strategies: List[BaseTradingStrategy] = []
         self.is_trading: bool = False
+        # 已启动的策略，分发行情/订单/成交时直接使用，无需逐个检查 is_running
+        self._running_strategies: List[BaseTradingStrategy] = []
+        # 每个合约最近一次变化的行情，由 _quote_pacer 按固定频率分发给策略
+        self._latest_quotes: Dict[str, Quote] = {}
+        self._pacer_task: Optional[asyncio.Task] = None
+        # 订单/成交更新的有界缓冲队列：同步循环只负责入队，由 _strategy_dispatcher 分发
+        self._dispatch_q: Optional[asyncio.Queue] = None
+        self._dispatcher_task: Optional[asyncio.Task] = None
+
+    @property
+    def last_update_time(self) -> Optional[datetime]:
+        """最近一次数据同步完成的时间"""
+        if self._last_update_mono is None:
+            return None
+        wall_time, mono_time = self._wall_epoch
+        return datetime.fromtimestamp(wall_time + (self._last_update_mono - mono_time))
 
     def _setup_logger(self) -> logging.Logger:
         """设置日志记录器"""
@@ -82,11 +138,17 @@ class MyDataManager:
             # 创建API连接
             auth = TqAuth(self.config.TQ_USERNAME, self.config.TQ_PASSWORD)
             self.api = TqApi(auth=auth)
+            self._wall_epoch = (time.time(), time.monotonic())
+            self._close_is_coro = asyncio.iscoroutinefunction(self.api.close)
 
             # 获取天勤原始数据对象
             self.tq_account = self.api.get_account()
             test_symbol = self.config.TEST_SYMBOL
             self.tq_positions[test_symbol] = self.api.get_position(test_symbol)
+            self.tq_quotes[test_symbol] = self.api.get_quote(test_symbol)
+            # 天勤就地更新委托单/成交容器，缓存一次引用即可，无需每次同步重新查找
+            self.tq_orders = self.api.get_order()
+            self.tq_trades = self.api.get_trade()
 
             # 等待初始数据就绪
             self.api.wait_update()
@@ -104,7 +166,7 @@ class MyDataManager:
             return True
 
         except Exception as e:
-            self.logger.error(f"连接天勤API失败: {e}")
+            self.logger.error(_MSG_CONNECT_FAILED, e)
             self.error_count += 1
             return False
 
@@ -112,6 +174,9 @@ class MyDataManager:
         """
         初始化自定义数据表对象 - 修复版本：完整实现
         """
+        for symbol in self.tq_positions:
+            self._pos_keys[symbol] = (f"{symbol}.LONG", f"{symbol}.SHORT")
+
         try:
             # 修复：导入必要的类（假设这些类存在）
             # 如果MyAccount和MyPosition在其他模块，需要正确导入
@@ -130,6 +195,7 @@ class MyDataManager:
             test_symbol = self.config.TEST_SYMBOL
             if test_symbol in self.tq_positions:
                 tq_position = self.tq_positions[test_symbol]
+                long_key, short_key = self._pos_keys[test_symbol]
 
                 # 多头持仓
                 long_position = MyPosition(
@@ -139,7 +205,7 @@ class MyDataManager:
                     direction="LONG"
                 )
                 long_position.update_from_tqsdk(tq_position)
-                self.my_positions[f"{test_symbol}.LONG"] = long_position
+                self.my_positions[long_key] = long_position
 
                 # 空头持仓
                 short_position = MyPosition(
@@ -149,20 +215,20 @@ class MyDataManager:
                     direction="SHORT"
                 )
                 short_position.update_from_tqsdk(tq_position)
-                self.my_positions[f"{test_symbol}.SHORT"] = short_position
+                self.my_positions[short_key] = short_position
 
-                self.logger.info(f"自定义持仓表初始化成功: {len(self.my_positions)}个持仓")
+                self.logger.info(_MSG_POS_INIT_OK, len(self.my_positions))
             else:
-                self.logger.warning(f"天勤持仓对象不存在（合约: {test_symbol}）")
+                self.logger.warning(_MSG_TQ_POS_MISSING, test_symbol)
 
             self.logger.info("自定义数据表初始化完成")
 
         except ImportError as e:
-            self.logger.error(f"导入自定义表类失败: {e}")
+            self.logger.error(_MSG_IMPORT_FAILED, e)
             # 修复：创建模拟对象用于测试
             self._create_mock_objects()
         except Exception as e:
-            self.logger.error(f"初始化自定义表时发生错误: {e}")
+            self.logger.error(_MSG_INIT_TABLES_FAILED, e)
             self._create_mock_objects()
 
     def _create_mock_objects(self):
@@ -194,7 +260,9 @@ class MyDataManager:
                 self.yd_volume = 0
                 self.price = 0.0
 
-            def update_from_tqsdk(self, tq_position):
+            def update_from_tqsdk(self, tq_position, api=None):
+                if api is not None and not api.is_changing(tq_position):
+                    return
                 if tq_position:
                     if self.direction == "LONG":
                         self.volume = getattr(tq_position, 'pos_long_his', 0) + getattr(tq_position, 'pos_long_today',
@@ -214,6 +282,7 @@ class MyDataManager:
         test_symbol = self.config.TEST_SYMBOL
         if test_symbol in self.tq_positions:
             tq_position = self.tq_positions[test_symbol]
+            long_key, short_key = self._pos_keys[test_symbol]
 
             # 模拟多头持仓
             long_position = MockPosition(
@@ -223,7 +292,7 @@ class MyDataManager:
                 direction="LONG"
             )
             long_position.update_from_tqsdk(tq_position)
-            self.my_positions[f"{test_symbol}.LONG"] = long_position
+            self.my_positions[long_key] = long_position
 
             # 模拟空头持仓
             short_position = MockPosition(
@@ -233,7 +302,293 @@ class MyDataManager:
                 direction="SHORT"
             )
             short_position.update_from_tqsdk(tq_position)
-            self.my_positions[f"{test_symbol}.SHORT"] = short_position
+            self.my_positions[short_key] = short_position
+
+    def _get_update_event(self) -> asyncio.Event:
+        """获取数据同步完成事件（延迟创建，当前事件循环与创建时不同时重新创建）"""
+        loop = asyncio.get_running_loop()
+        if self._update_event is None or self._update_event_loop is not loop:
+            self._update_event = asyncio.Event()
+            self._update_event_loop = loop
+        return self._update_event
+
+    async def start_data_sync(self):
+        """
+        数据同步循环：驱动 api.wait_update 收取天勤数据，每次有更新后同步所有自定义数据表，
+        并通过 _update_event 通知等待方
+        """
+        if not self.is_connected:
+            self.logger.error("API未连接，无法启动数据同步")
+            return
+
+        self.logger.info("数据同步已启动")
+        self._sync_task = asyncio.current_task()
+        update_event = self._get_update_event()
+        api = self.api
+        interval = self.config.DATA_UPDATE_INTERVAL
+        try:
+            # 天勤只在 wait_update 期间收包并更新数据对象，必须由本循环主动驱动；
+            # wait_update 是阻塞调用，用较短的 deadline，每轮之后让出事件循环给策略和分发任务
+            while self.is_connected:
+                updated = api.wait_update(deadline=time.time() + interval)
+                if updated:
+                    try:
+                        await self._sync_all_tables()
+                    except Exception as e:
+                        self.logger.error(_MSG_SYNC_FAILED, e)
+                        self.error_count += 1
+                    else:
+                        self.update_count += 1
+                        self._last_update_mono = time.monotonic()
+                        update_event.set()
+                await asyncio.sleep(0)
+        finally:
+            if self._sync_task is asyncio.current_task():
+                self._sync_task = None
+            self.logger.info("数据同步已停止")
+
+    def _start_sync_task(self):
+        """在当前事件循环中启动数据同步任务，已在运行时不重复启动"""
+        if self._sync_task is None:
+            self._sync_task = asyncio.create_task(self.start_data_sync())
+
+    async def _stop_sync_task(self):
+        """取消数据同步任务并等待其退出"""
+        sync_task, self._sync_task = self._sync_task, None
+        if sync_task is not None:
+            sync_task.cancel()
+            await asyncio.gather(sync_task, return_exceptions=True)
+
+    async def _wait_for_update(self, timeout: float = 5.0) -> bool:
+        """
+        等待下一次数据同步完成
+
+        Returns:
+            bool: 超时前是否完成了新的同步
+        """
+        update_event = self._get_update_event()
+        initial_count = self.update_count
+        update_event.clear()
+        try:
+            await asyncio.wait_for(update_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return self.update_count > initial_count
+
+    async def _sync_all_tables(self):
+        """同步所有自定义数据表，并把本次变化分发给运行中的策略"""
+        self._sync_account_data()
+        self._sync_position_data()
+        changed_orders = self._sync_order_data()
+        new_trades = self._sync_trade_data()
+        if time.monotonic() - self._last_cleanup_time >= self.config.CLEANUP_INTERVAL:
+            self._cleanup_tables()
+
+        if not self._running_strategies:
+            return
+
+        # 行情只记录最新值，由 _quote_pacer 统一分发
+        for symbol, quote in self.tq_quotes.items():
+            if self.api.is_changing(quote):
+                self._latest_quotes[symbol] = quote
+        # 订单和成交不能丢弃，队列满时等待分发任务腾出空间
+        dispatch_q = self._dispatch_q
+        for tq_order in changed_orders:
+            await dispatch_q.put(("order", tq_order))
+        for tq_trade in new_trades:
+            await dispatch_q.put(("trade", tq_trade))
+
+    def _sync_account_data(self):
+        """同步账户数据"""
+        if self.my_account is not None and self.tq_account is not None:
+            self.my_account.update_from_tqsdk(self.tq_account)
+
+    def _sync_position_data(self):
+        """
+        wait_update 之后同步持仓数据：把 api 传给 update_from_tqsdk，
+        由其通过 api.is_changing 跳过本次没有变化的持仓
+        """
+        api = self.api
+        my_positions = self.my_positions
+        pos_keys = self._pos_keys
+        for symbol, tq_position in self.tq_positions.items():
+            for key in pos_keys.get(symbol, ()):
+                position = my_positions.get(key)
+                if position is not None:
+                    position.update_from_tqsdk(tq_position, api=api)
+
+    def _get_tq_orders_dict(self) -> Dict[str, Order]:
+        """获取天勤全部委托单（以委托单号为键），使用 connect 时缓存的引用"""
+        return self.tq_orders
+
+    def _get_tq_trades_dict(self) -> Dict[str, Trade]:
+        """获取天勤全部成交记录（以成交编号为键），使用 connect 时缓存的引用"""
+        return self.tq_trades
+
+    def _sync_order_data(self) -> List[Order]:
+        """
+        同步委托单数据：新委托单创建自定义对象，已有委托单就地更新
+
+        Returns:
+            List[Order]: 本次有变化的天勤委托单
+        """
+        gateway_name = self.config.GATEWAY_NAME
+        api = self.api
+        my_orders = self.my_orders
+        active_orders = self._active_orders
+        tq_orders = self._get_tq_orders_dict()
+        # 大多数更新只有行情变化：委托单容器整体没有变化时跳过逐单扫描
+        # （首次同步时 my_orders 为空，需要全量建立）
+        if my_orders and not api.is_changing(tq_orders):
+            return []
+
+        # 首次同步之后只处理本次有变化的委托单：新委托单出现时必然有变化，
+        # 已被 _cleanup_tables 清理的已结束委托单不再变化，不会被重新加入
+        full_build = not my_orders
+        changed_orders = []
+        for order_id, tq_order in tq_orders.items():
+            if not full_build and not api.is_changing(tq_order):
+                continue
+            vt_orderid = f"{gateway_name}.{order_id}"
+            order = my_orders.get(vt_orderid)
+            if order is None:
+                order = my_orders[vt_orderid] = MyOrder(gateway_name, order_id)
+
+            order.update_from_tqsdk(tq_order)
+            if order.is_active():
+                active_orders[vt_orderid] = order
+            else:
+                active_orders.pop(vt_orderid, None)
+            changed_orders.append(tq_order)
+        return changed_orders
+
+    def _sync_trade_data(self) -> List[Trade]:
+        """
+        同步成交数据：成交记录不可变，只需为新成交创建自定义对象
+
+        Returns:
+            List[Trade]: 本次新增的天勤成交记录
+        """
+        gateway_name = self.config.GATEWAY_NAME
+        api = self.api
+        my_trades = self.my_trades
+        tq_trades = self._get_tq_trades_dict()
+        if my_trades and not api.is_changing(tq_trades):
+            return []
+
+        # 首次同步之后只有新成交会出现变化，已清理的成交不会被重新加入
+        full_build = not my_trades
+        new_trades = []
+        updates = []
+        for trade_id, tq_trade in tq_trades.items():
+            if not full_build and not api.is_changing(tq_trade):
+                continue
+            vt_tradeid = f"{gateway_name}.{trade_id}"
+            if vt_tradeid in my_trades:
+                continue
+            trade = my_trades[vt_tradeid] = MyTrade(gateway_name, trade_id)
+            updates.append((trade, tq_trade))
+            new_trades.append(tq_trade)
+        if updates:
+            # 新成交收集齐后一次性批量填充字段
+            MyTrade.bulk_update_from_tqsdk(updates)
+        return new_trades
+
+    def _cleanup_tables(self):
+        """
+        定期清理：订单/成交数量超过 MAX_CACHE_SIZE 时，按创建顺序移除最早的
+        已结束订单和成交记录
+        """
+        self._last_cleanup_time = time.monotonic()
+        max_size = self.config.MAX_CACHE_SIZE
+
+        released_orders = 0
+        excess = len(self.my_orders) - max_size
+        if excess > 0:
+            finished = (k for k, o in self.my_orders.items() if not o.is_active())
+            for vt_orderid in list(islice(finished, excess)):
+                del self.my_orders[vt_orderid]
+                released_orders += 1
+
+        released_trades = 0
+        excess = len(self.my_trades) - max_size
+        if excess > 0:
+            for vt_tradeid in list(islice(self.my_trades, excess)):
+                del self.my_trades[vt_tradeid]
+                released_trades += 1
+
+        if released_orders or released_trades:
+            self.logger.info(_MSG_CLEANUP_DONE, released_orders, released_trades)
+
+    async def dispatch_market_data_to_strategies(self, symbol: str, quote: Quote):
+        """把行情分发给所有运行中的策略"""
+        # 标记一次新的分发：订阅同一合约的多个策略只向共享价格缓冲区写入一次
+        QUOTE_BOOK.begin_dispatch(symbol)
+        strategies = list(self._running_strategies)
+        await self._dispatch_to_strategies("行情", strategies, [s._on_md for s in strategies], symbol, quote)
+
+    async def dispatch_order_update_to_strategies(self, tq_order: Order):
+        """把委托单更新分发给所有运行中的策略"""
+        strategies = list(self._running_strategies)
+        await self._dispatch_to_strategies("订单更新", strategies, [s._on_ou for s in strategies], tq_order)
+
+    async def dispatch_trade_update_to_strategies(self, tq_trade: Trade):
+        """把成交更新分发给所有运行中的策略"""
+        strategies = list(self._running_strategies)
+        await self._dispatch_to_strategies("成交更新", strategies, [s._on_tu for s in strategies], tq_trade)
+
+    async def _dispatch_to_strategies(self, kind: str, strategies: List[BaseTradingStrategy],
+                                      callbacks: List[Callable[..., Any]], *args):
+        """
+        调用各策略的回调：普通函数回调直接执行，协程函数回调返回的协程再并发等待，
+        同步回调不必为每次事件创建协程对象
+        """
+        results: List[Any] = [None] * len(callbacks)
+        pending, pending_idx = [], []
+        for i, callback in enumerate(callbacks):
+            try:
+                result = callback(*args)
+            except Exception as e:
+                results[i] = e
+                continue
+            if asyncio.iscoroutine(result):
+                pending.append(result)
+                pending_idx.append(i)
+        if pending:
+            for i, result in zip(pending_idx, await asyncio.gather(*pending, return_exceptions=True)):
+                results[i] = result
+        self._log_dispatch_errors(strategies, results, kind)
+
+    async def _quote_pacer(self):
+        """按 DATA_UPDATE_INTERVAL 的固定频率，把每个合约最新的行情分发给策略"""
+        interval = self.config.DATA_UPDATE_INTERVAL
+        while self.is_trading:
+            await asyncio.sleep(interval)
+            if not self._latest_quotes:
+                continue
+            latest_quotes, self._latest_quotes = self._latest_quotes, {}
+            await asyncio.gather(*(self.dispatch_market_data_to_strategies(symbol, quote)
+                                   for symbol, quote in latest_quotes.items()))
+
+    async def _strategy_dispatcher(self):
+        """按入队顺序把订单/成交更新分发给策略，与数据同步循环解耦"""
+        dispatch_q = self._dispatch_q
+        while True:
+            kind, data = await dispatch_q.get()
+            try:
+                if kind == "order":
+                    await self.dispatch_order_update_to_strategies(data)
+                else:
+                    await self.dispatch_trade_update_to_strategies(data)
+            finally:
+                dispatch_q.task_done()
+
+    def _log_dispatch_errors(self, strategies: List[BaseTradingStrategy], results: List[Any], kind: str):
+        """记录策略回调中抛出的异常，单个策略出错不影响其他策略"""
+        for strategy, result in zip(strategies, results):
+            if isinstance(result, Exception):
+                self.logger.error(_MSG_DISPATCH_FAILED, strategy.name, kind, result)
+                self.error_count += 1
 
     def get_account(self):
         """获取自定义账户对象 - 修复版本：添加验证"""
@@ -246,39 +601,131 @@ class MyDataManager:
         key = f"{symbol}.{direction}"
         position = self.my_positions.get(key)
         if position is None:
-            self.logger.warning(f"自定义持仓对象未初始化（键: {key}），返回None")
+            self.logger.warning(_MSG_POS_MISSING, key)
         return position
 
+    def get_tq_position(self, symbol: str) -> Optional[Position]:
+        """获取天勤持仓对象（未连接时返回None），供策略判断可平仓手数"""
+        tq_position = self.tq_positions.get(symbol)
+        if tq_position is None and self.api is not None:
+            # 天勤对同一合约返回同一个就地更新的持仓对象，无需另行缓存
+            tq_position = self.api.get_position(symbol)
+        return tq_position
+
+    async def place_order(self, symbol: str, direction: str, volume: int,
+                          price_type: str = "LIMIT", price: Optional[float] = None,
+                          offset: str = "OPEN") -> Optional[str]:
+        """
+        下单：通过天勤 insert_order 提交委托，委托在数据同步循环下一次 wait_update 时发出
+
+        Args:
+            symbol: 合约代码，如 "SHFE.cu2410"
+            direction: "BUY" / "SELL"
+            volume: 委托手数
+            price_type: "LIMIT" 限价单 / "MARKET" 市价单
+            price: 限价单价格，不填时使用该合约的最新价
+            offset: 开平标志 "OPEN" / "CLOSE" / "CLOSETODAY"
+
+        Returns:
+            Optional[str]: 天勤委托单号，未连接或无法确定价格时返回None
+        """
+        if not self.is_connected:
+            self.logger.error("API未连接，无法下单")
+            return None
+
+        limit_price = None
+        if price_type == "LIMIT":
+            limit_price = price
+            if limit_price is None:
+                quote = self.tq_quotes.get(symbol)
+                if quote is None:
+                    quote = self.tq_quotes[symbol] = self.api.get_quote(symbol)
+                limit_price = quote.last_price
+            if limit_price is None or math.isnan(limit_price):
+                self.logger.error(_MSG_ORDER_NO_PRICE, symbol)
+                return None
+
+        # 下单异常直接抛给调用方（策略的 place_order / flush_orders 负责记录）
+        tq_order = self.api.insert_order(symbol=symbol, direction=direction, offset=offset,
+                                         volume=volume, limit_price=limit_price)
+        self.logger.info(_MSG_ORDER_PLACED, symbol, direction, offset, volume, limit_price, tq_order.order_id)
+        return tq_order.order_id
+
     def add_trading_strategy(self, strategy: BaseTradingStrategy):
         """添加交易策略"""
         strategy.set_data_manager(self)
         self.trading_strategies.append(strategy)
-        self.logger.info(f"已添加策略: {strategy.name}")
+
+        # 订阅策略合约的行情，使其能收到行情回调
+        symbol = getattr(strategy, "symbol", None)
+        if self.api is not None and symbol and symbol not in self.tq_quotes:
+            self.tq_quotes[symbol] = self.api.get_quote(symbol)
+        self.logger.info(_MSG_STRATEGY_ADDED, strategy.name)
+
+    def remove_trading_strategy(self, strategy: BaseTradingStrategy):
+        """移除交易策略"""
+        if strategy in self.trading_strategies:
+            self.trading_strategies.remove(strategy)
+        if strategy in self._running_strategies:
+            self._running_strategies.remove(strategy)
+        self.logger.info(_MSG_STRATEGY_REMOVED, strategy.name)
 
     async def start_trading(self):
-        """启动所有交易策略"""
+        """并发启动所有交易策略，单个策略启动失败不影响其他策略"""
+        if self.is_trading:
+            # 已在交易中：重复启动会重复登记运行中的策略并泄漏分发任务
+            self.logger.warning("交易策略已在运行，忽略重复启动")
+            return
         self.is_trading = True
-        for strategy in self.trading_strategies:
-            await strategy.start()
+        strategies = list(self.trading_strategies)
+        results = await asyncio.gather(*(s.start() for s in strategies), return_exceptions=True)
+        for strategy, result in zip(strategies, results):
+            if isinstance(result, Exception):
+                self.logger.error(_MSG_STRATEGY_START_FAILED, strategy.name, result)
+                self.error_count += 1
+            else:
+                self._running_strategies.append(strategy)
+        self._pacer_task = asyncio.create_task(self._quote_pacer())
+        self._dispatch_q = asyncio.Queue(maxsize=self.config.DISPATCH_QUEUE_SIZE)
+        self._dispatcher_task = asyncio.create_task(self._strategy_dispatcher())
+        self._start_sync_task()
         self.logger.info("所有交易策略已启动")
 
     async def stop_trading(self):
-        """停止所有交易策略"""
+        """并发停止所有交易策略"""
         self.is_trading = False
-        for strategy in self.trading_strategies:
-            await strategy.stop()
+        # 先停止生产者（数据同步循环），队列不再增长后等分发任务处理完剩余的订单/成交再取消，
+        # 避免同步循环阻塞在已无人消费的队列上，也不丢弃已入队的更新
+        await self._stop_sync_task()
+        if self._dispatcher_task is not None:
+            await self._dispatch_q.join()
+            self._dispatcher_task.cancel()
+            self._dispatcher_task = None
+        self._running_strategies.clear()
+        self._latest_quotes.clear()
+        if self._pacer_task is not None:
+            self._pacer_task.cancel()
+            self._pacer_task = None
+        strategies = list(self.trading_strategies)
+        results = await asyncio.gather(*(s.stop() for s in strategies), return_exceptions=True)
+        for strategy, result in zip(strategies, results):
+            if isinstance(result, Exception):
+                self.logger.error(_MSG_STRATEGY_STOP_FAILED, strategy.name, result)
+                self.error_count += 1
         self.logger.info("所有交易策略已停止")
 
     async def disconnect(self):
         """断开天勤API连接"""
+        await self._stop_sync_task()
+
         if self.api:
             try:
-                if asyncio.iscoroutinefunction(self.api.close):
+                if self._close_is_coro:
                     await self.api.close()
                 else:
                     self.api.close()
             except Exception as e:
-                self.logger.warning(f"关闭API连接时发生警告: {e}")
+                self.logger.warning(_MSG_CLOSE_WARNING, e)
             finally:
                 self.is_connected = False
                 self.logger.info("已断开天勤API连接")
@@ -295,21 +742,103 @@ class MyDataManager:
         """获取所有成交对象"""
         return list(self.my_trades.values())
 
+    def get_active_orders(self) -> List[MyOrder]:
+        """获取所有活跃（可成交或可撤销）的订单对象"""
+        return list(self._active_orders.values())
+
+    def validate_data_consistency(self) -> Dict[str, bool]:
+        """校验自定义数据表与天勤原始数据是否一致"""
+        return {
+            "account": self._validate_account_consistency(),
+            "position": self._validate_position_consistency(),
+            "order": self._validate_order_consistency(),
+            "trade": self._validate_trade_consistency(),
+        }
+
+    def _validate_account_consistency(self) -> bool:
+        """校验账户资金字段"""
+        if self.tq_account is None or self.my_account is None:
+            return False
+        eps = self.config.FLOAT_PRECISION
+        tq_account, my_account = self.tq_account, self.my_account
+        return (abs(tq_account.balance - my_account.balance) < eps
+                and abs(tq_account.available - my_account.available) < eps)
+
+    def _validate_position_consistency(self) -> bool:
+        """校验所有合约的多空持仓手数，一次遍历完成比较"""
+        my_positions = self.my_positions
+        for symbol, tq_position in self.tq_positions.items():
+            long_key, short_key = self._pos_keys.get(symbol, (None, None))
+            long_position = my_positions.get(long_key)
+            short_position = my_positions.get(short_key)
+            if long_position is None or short_position is None:
+                return False
+            if (long_position.volume != tq_position.pos_long_his + tq_position.pos_long_today
+                    or short_position.volume != tq_position.pos_short_his + tq_position.pos_short_today):
+                return False
+        return True
+
+    def _validate_order_consistency(self, sample_size: int = 3) -> bool:
+        """抽样校验委托单的委托量和成交量，只取前几个订单，不复制整个订单表"""
+        tq_orders = self._get_tq_orders_dict()
+        # 清理后自定义表最多缩减到 MAX_CACHE_SIZE 条，少于该数量说明有委托单未同步
+        if len(self.my_orders) < min(len(tq_orders), self.config.MAX_CACHE_SIZE):
+            return False
+        for order in islice(self.my_orders.values(), sample_size):
+            tq_order = tq_orders.get(order.orderid)
+            if tq_order is None:
+                return False
+            if (order.volume != tq_order.volume_orign
+                    or order.traded != tq_order.volume_orign - tq_order.volume_left):
+                return False
+        return True
+
+    def _validate_trade_consistency(self, sample_size: int = 3) -> bool:
+        """抽样校验成交记录的成交价和成交量"""
+        eps = self.config.FLOAT_PRECISION
+        tq_trades = self._get_tq_trades_dict()
+        if len(self.my_trades) < min(len(tq_trades), self.config.MAX_CACHE_SIZE):
+            return False
+        for trade in islice(self.my_trades.values(), sample_size):
+            tq_trade = tq_trades.get(trade.tradeid)
+            if tq_trade is None:
+                return False
+            if trade.volume != tq_trade.volume or abs(trade.price - tq_trade.price) >= eps:
+                return False
+        return True
+
+    def get_status_report(self) -> Dict[str, Any]:
+        """获取数据管理器运行状态报告"""
+        last_update_time = self.last_update_time
+        return {
+            "is_connected": self.is_connected,
+            "is_trading": self.is_trading,
+            "update_count": self.update_count,
+            "error_count": self.error_count,
+            "last_update_time": last_update_time.isoformat() if last_update_time else None,
+            "position_count": len(self.my_positions),
+            "order_count": len(self.my_orders),
+            "active_order_count": len(self._active_orders),
+            "trade_count": len(self.my_trades),
+            "strategy_count": len(self.trading_strategies),
+        }
+
 
 if __name__ == "__main__":
     # 测试代码
     async def test_fixed_manager():
         manager = MyDataManager()
         success = await manager.connect()
+        logger = manager.logger
         if success:
-            print("连接成功")
+            logger.info("连接成功")
             account = manager.get_account()
-            print(f"账户对象: {account is not None}")
+            logger.info("账户对象: %s", account is not None)
             if account:
-                print(f"账户余额: {account.balance}")
+                logger.info("账户余额: %s", account.balance)
             await manager.disconnect()
         else:
-            print("连接失败")
+            logger.error("连接失败")
 
 
     asyncio.run(test_fixed_manager())
@@ -3,6 +3,10 @@
 from datetime import datetime
 from typing import Optional
 
+# 天勤字段值 -> vn.py风格取值
+_DIR_MAP = {"BUY": "LONG", "SELL": "SHORT"}
+_TYPE_MAP = {"LIMIT": "LIMIT", "ANY": "MARKET"}
+
 class MyOrder:
     """
     自定义委托订单数据表。
@@ -10,6 +14,23 @@ class MyOrder:
     核心在于将天勤的简单订单状态(ALIVE/FINISHED)映射为更精细的vn.py风格状态。
     """
 
+    # 字段固定，用__slots__省去实例字典
+    __slots__ = ("gateway_name", "orderid", "_vt_orderid", "exchange_orderid",
+                 "symbol", "exchange", "vt_symbol",
+                 "direction", "offset", "type", "volume", "traded", "price", "trade_price",
+                 "volume_condition", "time_condition",
+                 "status", "last_msg", "datetime", "_insert_ns")
+
+    # (天勤订单是否已结束, 成交情况) -> vn.py风格状态
+    _STATUS_TABLE = {
+        (True, "zero"): "CANCELLED",     # 已撤销
+        (True, "full"): "ALLTRADED",     # 全部成交
+        (True, "part"): "CANCELLED",     # 部分成交后剩余部分被撤销，天勤的FINISHED可能包含这种情况
+        (False, "zero"): "NOTTRADED",    # 未成交
+        (False, "part"): "PARTTRADED",   # 部分成交
+        (False, "full"): "ALLTRADED",    # 全部成交（保护性逻辑）
+    }
+
     def __init__(self, gateway_name: str = "", orderid: str = ""):
         """
         初始化委托单对象。
@@ -21,7 +42,7 @@ class MyOrder:
         # 订单标识信息
         self.gateway_name: str = gateway_name
         self.orderid: str = orderid
-        self.vt_orderid: str = f"{gateway_name}.{orderid}"  # 虚拟订单ID，全局唯一
+        self._vt_orderid: Optional[str] = None  # 虚拟订单ID，首次访问 vt_orderid 时生成
         self.exchange_orderid: str = ""  # 交易所订单号
 
         # 合约信息
@@ -47,6 +68,17 @@ class MyOrder:
         self.last_msg: str = ""          # 状态信息
         self.datetime: Optional[datetime] = None  # 下单时间（Python datetime对象）
 
+        # 已转换为datetime的下单时间戳（纳秒），下单时间不变时不再重复转换
+        self._insert_ns: int = 0
+
+    @property
+    def vt_orderid(self) -> str:
+        """虚拟订单ID，全局唯一，格式: "gateway_name.orderid" """
+        vt_orderid = self._vt_orderid
+        if vt_orderid is None:
+            vt_orderid = self._vt_orderid = f"{self.gateway_name}.{self.orderid}"
+        return vt_orderid
+
     def update_from_tqsdk(self, tqsdk_order) -> None:
         """
         同步更新方法：从一个天勤的Order对象更新数据。
@@ -57,15 +89,19 @@ class MyOrder:
             tqsdk_order: 从天勤API获取的Order对象。
         """
         # 1. 更新基础信息
-        self.symbol = tqsdk_order.instrument_id
-        self.exchange = tqsdk_order.exchange_id
-        self.vt_symbol = f"{self.symbol}.{self.exchange}"
+        symbol = tqsdk_order.instrument_id
+        exchange = tqsdk_order.exchange_id
+        if symbol != self.symbol or exchange != self.exchange:
+            # 合约信息只在首次更新时变化，此时才重新生成vt_symbol
+            self.symbol = symbol
+            self.exchange = exchange
+            self.vt_symbol = f"{symbol}.{exchange}"
         self.exchange_orderid = tqsdk_order.exchange_order_id
 
         # 2. 更新订单属性
-        self.direction = "LONG" if tqsdk_order.direction == "BUY" else "SHORT"
+        self.direction = _DIR_MAP.get(tqsdk_order.direction, "SHORT")
         self.offset = tqsdk_order.offset
-        self.type = "LIMIT" if tqsdk_order.price_type == "LIMIT" else "MARKET"
+        self.type = _TYPE_MAP.get(tqsdk_order.price_type, "MARKET")
         self.volume = tqsdk_order.volume_orign
         self.traded = tqsdk_order.volume_orign - tqsdk_order.volume_left  # 计算已成交量
         self.price = tqsdk_order.limit_price
@@ -79,35 +115,25 @@ class MyOrder:
         self._update_status(tqsdk_order)
 
         # 4. 更新时间（将纳秒时间戳转换为datetime）
-        if tqsdk_order.insert_date_time > 0:
-            # 将纳秒时间戳转换为秒，然后创建datetime对象
-            self.datetime = datetime.fromtimestamp(tqsdk_order.insert_date_time / 1e9)
+        insert_ns = tqsdk_order.insert_date_time
+        if insert_ns > 0 and insert_ns != self._insert_ns:
+            # 下单时间在订单创建后不变，只在首次（或变化时）转换
+            self._insert_ns = insert_ns
+            self.datetime = datetime.fromtimestamp(insert_ns / 1e9)
 
     def _update_status(self, tqsdk_order) -> None:
         """
         内部方法：根据天勤订单状态和成交情况，推断并设置vn.py风格的精细状态。
         这是此类最核心的逻辑。
         """
-        # 计算已成交数量
-        traded_volume = tqsdk_order.volume_orign - tqsdk_order.volume_left
-
-        if tqsdk_order.status == "FINISHED":
-            # 订单已结束
-            if traded_volume == 0:
-                self.status = "CANCELLED"  # 已撤销
-            elif traded_volume == tqsdk_order.volume_orign:
-                self.status = "ALLTRADED"  # 全部成交
-            else:
-                # 部分成交后剩余部分被撤销
-                self.status = "CANCELLED"  # 天勤的FINISHED可能包含这种情况
+        volume_left = tqsdk_order.volume_left
+        if volume_left == tqsdk_order.volume_orign:
+            fill = "zero"
+        elif volume_left == 0:
+            fill = "full"
         else:
-            # 订单仍活跃 (ALIVE)
-            if traded_volume == 0:
-                self.status = "NOTTRADED"  # 未成交
-            elif traded_volume < tqsdk_order.volume_orign:
-                self.status = "PARTTRADED" # 部分成交
-            else:
-                self.status = "ALLTRADED"  # 全部成交（保护性逻辑）
+            fill = "part"
+        self.status = self._STATUS_TABLE[(tqsdk_order.status == "FINISHED", fill)]
 
     def is_active(self) -> bool:
         """
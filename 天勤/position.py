@@ -2,6 +2,12 @@
 
 from typing import Optional
 
+# 各方向持仓在天勤Position对象中对应的字段，用于 api.is_changing 的细粒度变化检测
+_LONG_FIELDS = ["pos_long_his", "pos_long_today", "volume_long_frozen",
+                "position_price_long", "float_profit_long", "margin_long"]
+_SHORT_FIELDS = ["pos_short_his", "pos_short_today", "volume_short_frozen",
+                 "position_price_short", "float_profit_short", "margin_short"]
+
 class MyPosition:
     """
     自定义持仓数据表。
@@ -9,6 +15,9 @@ class MyPosition:
     移除协程依赖，改为纯数据对象，风格更接近vn.py。
     """
 
+    __slots__ = ("gateway_name", "symbol", "exchange", "direction", "_vt_symbol", "_vt_positionid",
+                 "volume", "yd_volume", "frozen", "price", "pnl", "margin")
+
     def __init__(self, gateway_name: str = "", symbol: str = "", exchange: str = "", direction: str = ""):
         """
         初始化持仓对象。
@@ -24,8 +33,9 @@ class MyPosition:
         self.symbol: str = symbol
         self.exchange: str = exchange
         self.direction: str = direction  # "LONG" 或 "SHORT"
-        self.vt_symbol: str = f"{symbol}.{exchange}"  # 虚拟合约代码
-        self.vt_positionid: str = f"{gateway_name}.{self.vt_symbol}.{direction}"  # 虚拟持仓ID，全局唯一
+        # 虚拟合约代码和虚拟持仓ID在首次访问时生成
+        self._vt_symbol: Optional[str] = None
+        self._vt_positionid: Optional[str] = None
 
         # 持仓数据
         self.volume: int = 0           # 总持仓量
@@ -36,7 +46,23 @@ class MyPosition:
         # 以下为可选风控字段
         self.margin: float = float("nan") # 保证金占用
 
-    def update_from_tqsdk(self, tqsdk_position) -> None:
+    @property
+    def vt_symbol(self) -> str:
+        """虚拟合约代码，格式: "symbol.exchange" """
+        vt_symbol = self._vt_symbol
+        if vt_symbol is None:
+            vt_symbol = self._vt_symbol = f"{self.symbol}.{self.exchange}"
+        return vt_symbol
+
+    @property
+    def vt_positionid(self) -> str:
+        """虚拟持仓ID，全局唯一"""
+        vt_positionid = self._vt_positionid
+        if vt_positionid is None:
+            vt_positionid = self._vt_positionid = f"{self.gateway_name}.{self.vt_symbol}.{self.direction}"
+        return vt_positionid
+
+    def update_from_tqsdk(self, tqsdk_position, api=None) -> None:
         """
         同步更新方法：从一个天勤的Position对象更新数据。
 
@@ -45,7 +71,14 @@ class MyPosition:
 
         Args:
             tqsdk_position: 从天勤API获取的Position对象。
+            api: 可选的TqApi对象。传入时，若本方向的字段在最近一次 wait_update 中
+                 没有变化则直接返回，不再重复拷贝；初始化时不传，保证全量拷贝。
         """
+        if api is not None:
+            fields = _LONG_FIELDS if self.direction == "LONG" else _SHORT_FIELDS
+            if not api.is_changing(tqsdk_position, fields):
+                return
+
         if self.direction == "LONG":
             # 更新多头持仓数据
             self.volume = tqsdk_position.pos_long_his + tqsdk_position.pos_long_today
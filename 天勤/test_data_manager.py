@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+数据管理器的离线测试 - 不连接天勤API
+覆盖内容：
+1. 策略回调分发：普通函数与协程函数回调混合、回调异常的记录
+"""
+
+import unittest
+from types import SimpleNamespace
+
+from my_data_manager import MyDataManager
+
+
+class TestDispatchToStrategies(unittest.IsolatedAsyncioTestCase):
+    """_dispatch_to_strategies 测试"""
+
+    async def test_mixed_sync_and_async_callbacks(self):
+        """普通函数和协程函数回调都被调用，抛出的异常逐个计入错误数，不影响其他回调"""
+        data_manager = MyDataManager()
+        calls = []
+
+        def sync_ok(symbol, quote):
+            calls.append(("sync_ok", symbol, quote))
+
+        async def async_ok(symbol, quote):
+            calls.append(("async_ok", symbol, quote))
+
+        def sync_fail(symbol, quote):
+            calls.append(("sync_fail", symbol, quote))
+            raise ValueError("sync")
+
+        async def async_fail(symbol, quote):
+            calls.append(("async_fail", symbol, quote))
+            raise RuntimeError("async")
+
+        callbacks = [sync_ok, sync_fail, async_ok, async_fail]
+        strategies = [SimpleNamespace(name=callback.__name__) for callback in callbacks]
+        error_count = data_manager.error_count
+
+        with self.assertLogs(data_manager.logger, level="ERROR") as captured:
+            await data_manager._dispatch_to_strategies("行情", strategies, callbacks, "SHFE.cu2410", 1.0)
+
+        self.assertEqual(sorted(name for name, _, _ in calls), ["async_fail", "async_ok", "sync_fail", "sync_ok"])
+        self.assertTrue(all(call[1:] == ("SHFE.cu2410", 1.0) for call in calls))
+        self.assertEqual(data_manager.error_count, error_count + 2)
+        self.assertEqual(len(captured.records), 2)
+        self.assertIn("sync_fail", captured.records[0].getMessage())
+        self.assertIn("async_fail", captured.records[1].getMessage())
+
+    async def test_sync_callbacks_only(self):
+        """全部为普通函数回调时不创建协程，也不记录错误"""
+        data_manager = MyDataManager()
+        calls = []
+        callbacks = [lambda order: calls.append(order), lambda order: calls.append(order)]
+        strategies = [SimpleNamespace(name="a"), SimpleNamespace(name="b")]
+
+        await data_manager._dispatch_to_strategies("订单更新", strategies, callbacks, "o1")
+
+        self.assertEqual(calls, ["o1", "o1"])
+        self.assertEqual(data_manager.error_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,100 +10,214 @@
 """
 
 import asyncio
+import math
+import os
 import unittest
 import time
 import logging
 import sys
-from datetime import datetime
-from typing import Dict, Any
+from typing import Optional
 
 from config import CurrentConfig
 from my_data_manager import MyDataManager
-from trading_strategies import create_strategy, BaseTradingStrategy
+from trading_strategies import create_strategy
 
 
-class BaseTQSdkIntegration(unittest.TestCase):
+# 测试中反复读取的配置项，导入时取一次
+_TEST_DURATION = CurrentConfig.TEST_DURATION
+_TEST_SYMBOL = CurrentConfig.TEST_SYMBOL
+_FLOAT_PREC = CurrentConfig.FLOAT_PRECISION
+_STOP_LOSS = CurrentConfig.RISK_MANAGEMENT["STOP_LOSS_RATIO"]
+
+# 耗时的实盘策略测试默认跳过，设置环境变量 RUN_STRATEGY_TEST=1 时才运行
+RUN_STRATEGY_TEST = os.environ.get("RUN_STRATEGY_TEST") == "1"
+
+# 所有测试类共用的日志记录器，处理器只在 _configure_logging 中安装一次
+_LOGGER = logging.getLogger("TQSdkIntegrationTest")
+_LOGGING_CONFIGURED = False
+
+
+def _configure_logging():
+    """配置测试日志：安装标准输出处理器并设置日志级别，重复调用时直接返回"""
+    global _LOGGING_CONFIGURED
+    if _LOGGING_CONFIGURED:
+        return
+    _LOGGER.setLevel(getattr(logging, CurrentConfig.LOG_LEVEL))
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    _LOGGER.addHandler(handler)
+    _LOGGING_CONFIGURED = True
+
+
+# 配置校验结果，首个测试类校验后缓存，后续测试类直接复用
+_CONFIG_VALID: Optional[bool] = None
+
+
+# 所有测试共享的数据管理器：整个模块只连接一次天勤API并等待一次初始数据
+_SHARED_DM: Optional[MyDataManager] = None
+
+
+def setUpModule():
+    """模块级别的设置：连接天勤API"""
+    global _SHARED_DM
+    data_manager = MyDataManager()
+    if asyncio.run(data_manager.connect()):
+        time.sleep(2)  # 等待初始数据就绪
+        _SHARED_DM = data_manager
+
+
+def tearDownModule():
+    """模块级别的清理：断开天勤API连接"""
+    if _SHARED_DM is not None and _SHARED_DM.is_connected:
+        asyncio.run(_SHARED_DM.disconnect())
+
+
+class BaseTQSdkIntegration(unittest.IsolatedAsyncioTestCase):
     """
     天勤SDK集成测试基类
     功能：提供共享的测试框架方法，不被unittest直接加载（类名不以Test开头）
     """
 
     # 测试运行时长（秒）
-    TEST_DURATION = CurrentConfig.TEST_DURATION
+    TEST_DURATION = _TEST_DURATION
 
     @classmethod
     def setUpClass(cls):
         """测试类级别的设置"""
-        cls.logger = logging.getLogger("TQSdkIntegrationTest")
-        cls.logger.setLevel(getattr(logging, CurrentConfig.LOG_LEVEL))
-
-        if not cls.logger.handlers:
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            handler = logging.StreamHandler(sys.stdout)
-            handler.setFormatter(formatter)
-            cls.logger.addHandler(handler)
+        _configure_logging()
+        cls.logger = _LOGGER
 
         cls.logger.info("=" * 60)
         cls.logger.info("开始天勤SDK集成测试")
         cls.logger.info("=" * 60)
 
-        if not CurrentConfig.validate_config():
+        global _CONFIG_VALID
+        if _CONFIG_VALID is None:
+            _CONFIG_VALID = CurrentConfig.validate_config()
+        if not _CONFIG_VALID:
             raise unittest.SkipTest("配置验证失败，跳过所有测试")
 
-    def setUp(self):
-        """每个测试方法前的设置"""
+    async def asyncSetUp(self):
+        """每个测试方法前的设置（与测试方法共用同一个事件循环）"""
         self.start_time = time.time()
         self.data_manager = None
         self.test_passed = False
+        await self._initialize_data_manager()
 
-    def tearDown(self):
+    async def asyncTearDown(self):
         """每个测试方法后的清理"""
         if self.data_manager:
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    import threading
-                    def run_async():
-                        new_loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(new_loop)
-                        new_loop.run_until_complete(self._async_teardown())
-                        new_loop.close()
-
-                    thread = threading.Thread(target=run_async)
-                    thread.start()
-                    thread.join()
-                else:
-                    asyncio.run(self._async_teardown())
-            except:
-                asyncio.run(self._async_teardown())
+            await self._async_teardown()
 
         duration = time.time() - self.start_time
         status = "通过" if self.test_passed else "失败"
-        self.logger.info(f"测试 {self._testMethodName} {status}，耗时: {duration:.2f}秒")
+        self.logger.info("测试 %s %s，耗时: %.2f秒", self._testMethodName, status, duration)
 
     async def _async_teardown(self):
-        """异步清理资源"""
-        if hasattr(self.data_manager, 'is_connected') and self.data_manager.is_connected:
-            await self.data_manager.disconnect()
+        """异步清理资源：连接由模块共享，这里只确保策略已停止，避免状态泄漏到下一个测试"""
+        if self.data_manager.is_trading:
+            await self.data_manager.stop_trading()
 
     async def _initialize_data_manager(self):
-        """初始化数据管理器并连接天勤API"""
-        self.data_manager = MyDataManager()
-        success = await self.data_manager.connect()
-
-        if not success:
+        """获取模块共享的数据管理器（已连接天勤API）"""
+        self.data_manager = _SHARED_DM
+        if self.data_manager is None:
             self.skipTest("无法连接天勤API，跳过测试")
-
-        await asyncio.sleep(2)
         return True
 
-    def log_progress(self, step_name):
-        """记录测试进度"""
+    def _test_account_data_consistency(self):
+        """校验账户权益和可用资金"""
+        tq_account = self.data_manager.tq_account
+        my_account = self.data_manager.get_account()
+
+        self.assertIsNotNone(tq_account, "天勤账户对象不应为None")
+        self.assertIsNotNone(my_account, "自定义账户对象不应为None")
+
+        self.assertAlmostEqual(tq_account.balance, my_account.balance, places=6, msg="账户余额不一致")
+        self.assertAlmostEqual(tq_account.available, my_account.available, places=6, msg="可用资金不一致")
+
+    def _test_position_data_consistency(self):
+        """校验测试合约的多空持仓手数"""
+        test_symbol = _TEST_SYMBOL
+        tq_position = self.data_manager.tq_positions.get(test_symbol)
+        self.assertIsNotNone(tq_position, f"天勤持仓对象不应为None（合约: {test_symbol}）")
+
+        my_long_position = self.data_manager.get_position(test_symbol, "LONG")
+        my_short_position = self.data_manager.get_position(test_symbol, "SHORT")
+
+        self.assertIsNotNone(my_long_position, "自定义多头持仓对象不应为None")
+        self.assertIsNotNone(my_short_position, "自定义空头持仓对象不应为None")
+
+        tq_long_volume = tq_position.pos_long_his + tq_position.pos_long_today
+        self.assertEqual(tq_long_volume, my_long_position.volume, "多头持仓手数不一致")
+
+        tq_short_volume = tq_position.pos_short_his + tq_position.pos_short_today
+        self.assertEqual(tq_short_volume, my_short_position.volume, "空头持仓手数不一致")
+
+    def _test_order_data_consistency(self):
+        """整表校验委托单：先收集两侧字段，再一次性比较，失败时给出不一致的下标"""
+        tq_orders = self.data_manager._get_tq_orders_dict()
+        my_orders = self.data_manager.get_all_orders()
+        # 先比较两侧的委托单号集合，自定义表缺少或多出记录时直接失败
+        self.assertEqual({order.orderid for order in my_orders}, set(tq_orders), "委托单号集合不一致")
+
+        tq_rows, my_rows, tq_prices, my_prices = [], [], [], []
+        for order in my_orders:
+            tq_order = tq_orders.get(order.orderid)
+            self.assertIsNotNone(tq_order, f"天勤委托单不存在: {order.orderid}")
+            tq_rows.append((tq_order.instrument_id, tq_order.volume_orign,
+                            tq_order.volume_orign - tq_order.volume_left))
+            my_rows.append((order.symbol, order.volume, order.traded))
+            tq_prices.append(tq_order.limit_price)
+            my_prices.append(order.price)
+
+        self._assert_rows_equal("委托单", tq_rows, my_rows)
+        self._assert_prices_close("委托价", tq_prices, my_prices)
+
+    def _test_trade_data_consistency(self):
+        """整表校验成交记录的合约、成交量和成交价"""
+        tq_trades = self.data_manager._get_tq_trades_dict()
+        my_trades = self.data_manager.get_all_trades()
+        # 先比较两侧的成交编号集合，自定义表缺少或多出记录时直接失败
+        self.assertEqual({trade.tradeid for trade in my_trades}, set(tq_trades), "成交编号集合不一致")
+
+        tq_rows, my_rows, tq_prices, my_prices = [], [], [], []
+        for trade in my_trades:
+            tq_trade = tq_trades.get(trade.tradeid)
+            self.assertIsNotNone(tq_trade, f"天勤成交记录不存在: {trade.tradeid}")
+            tq_rows.append((tq_trade.instrument_id, tq_trade.volume))
+            my_rows.append((trade.symbol, trade.volume))
+            tq_prices.append(tq_trade.price)
+            my_prices.append(trade.price)
+
+        self._assert_rows_equal("成交记录", tq_rows, my_rows)
+        self._assert_prices_close("成交价", tq_prices, my_prices)
+
+    def _assert_rows_equal(self, label, tq_rows, my_rows):
+        """整体比较两侧字段，只在不一致时才逐行定位"""
+        if tq_rows == my_rows:
+            return
+        mismatched = [i for i, (tq_row, my_row) in enumerate(zip(tq_rows, my_rows)) if tq_row != my_row]
+        self.fail(f"{label}数据不一致，下标: {mismatched}")
+
+    def _assert_prices_close(self, label, tq_prices, my_prices):
+        """按FLOAT_PRECISION比较价格，两侧同为NaN（如市价单）视为一致"""
+        mismatched = [
+            i for i, (tq_price, my_price) in enumerate(zip(tq_prices, my_prices))
+            if not (math.isclose(tq_price, my_price, abs_tol=_FLOAT_PREC)
+                    or (math.isnan(tq_price) and math.isnan(my_price)))
+        ]
+        self.assertFalse(mismatched, f"{label}不一致，下标: {mismatched}")
+
+    def log_progress(self, step_name, *args):
+        """记录测试进度（INFO级别未启用时直接返回，不做任何格式化）"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         current_time = time.time()
         if not hasattr(self, 'test_start_time'):
             self.test_start_time = current_time
         elapsed = current_time - self.test_start_time
-        print(f"[进度监控] {step_name} - 已运行: {elapsed:.1f}秒")
+        self.logger.info("[进度监控] %s - 已运行: %.1f秒", step_name % args if args else step_name, elapsed)
 
 
 class TestTQSdkIntegration(BaseTQSdkIntegration):
@@ -112,17 +226,12 @@ class TestTQSdkIntegration(BaseTQSdkIntegration):
     包含原基类的测试方法，避免重复加载
     """
 
-    def test_with_double_ma_strategy(self):
-        """双均线策略测试 - 修复版本"""
-        asyncio.run(self._test_with_double_ma_strategy_async())
-
-    async def _test_with_double_ma_strategy_async(self):
-        """异步实现 - 修复策略启动错误"""
-        await self._initialize_data_manager()
-
-        # 创建策略配置
+    @unittest.skipUnless(RUN_STRATEGY_TEST, "耗时的实盘策略测试，设置 RUN_STRATEGY_TEST=1 启用")
+    async def test_with_double_ma_strategy(self):
+        """双均线策略测试 - 修复策略启动错误"""
+        # 创建策略配置（使用配置中的测试合约，保证测试期间有行情推送）
         strategy_config = {
-            "symbol": "SHFE.bu2012",
+            "symbol": _TEST_SYMBOL,
             "short_period": 5,
             "long_period": 10,
             "volume": 1
@@ -131,129 +240,125 @@ class TestTQSdkIntegration(BaseTQSdkIntegration):
         # 创建策略实例
         strategy = create_strategy("double_ma", strategy_config)
 
-        # 添加策略到数据管理器
+        # 添加策略到数据管理器（共享的数据管理器，测试结束后必须移除）
         self.data_manager.add_trading_strategy(strategy)
+        try:
+            # 启动策略，同时启动数据同步循环
+            await self.data_manager.start_trading()
+            self.assertIsNotNone(self.data_manager._sync_task, "启动交易后数据同步循环应在运行")
 
-        # 启动策略
-        await self.data_manager.start_trading()
-
-        # 运行策略一段时间
-        await asyncio.sleep(60)
+            # 等待策略收到足够行情或首笔成交，最长60秒
+            try:
+                await asyncio.wait_for(strategy._signal_event.wait(), timeout=60)
+            except asyncio.TimeoutError:
+                self.fail("等待策略信号超时：60秒内策略未收到足够行情或成交")
+        finally:
+            # 停止并移除策略
+            await self.data_manager.stop_trading()
+            self.data_manager.remove_trading_strategy(strategy)
 
-        # 验证数据
         self._verify_data_consistency()
 
-        # 停止策略
-        await self.data_manager.stop_trading()
-
         self.test_passed = True
 
     def _verify_data_consistency(self):
-        """验证数据一致性"""
-        # 简化验证逻辑
-        account = self.data_manager.get_account()
-        if account:
-            self.assertIsNotNone(account.balance)
-            self.logger.info("基础数据验证通过")
+        """验证数据一致性：各项校验互不依赖，每项作为子测试独立报告，一项失败不影响其余各项"""
+        checks = (
+            ("账户", self._test_account_data_consistency),
+            ("持仓", self._test_position_data_consistency),
+            ("委托单", self._test_order_data_consistency),
+            ("成交记录", self._test_trade_data_consistency),
+        )
+        for name, check in checks:
+            with self.subTest(check=name):
+                check()
+        self.logger.info("策略运行后数据一致性验证完成")
 
 
 class TestDataConsistency(BaseTQSdkIntegration):
     """数据一致性测试类"""
 
-    def test_account_data_consistency(self):
-        """测试账户数据一致性"""
-        asyncio.run(self._test_account_data_consistency_async())
-
-    async def _test_account_data_consistency_async(self):
-        """异步的账户数据一致性测试"""
-        await self._initialize_data_manager()
-
-        tq_account = self.data_manager.tq_account
-        my_account = self.data_manager.get_account()
-
-        self.assertIsNotNone(tq_account, "天勤账户对象不应为None")
-        self.assertIsNotNone(my_account, "自定义账户对象不应为None")
+    async def asyncSetUp(self):
+        """connect 只初始化账户和持仓，委托单和成交记录需先同步一次才会建立"""
+        await super().asyncSetUp()
+        self.data_manager._sync_order_data()
+        self.data_manager._sync_trade_data()
 
-        tolerance = CurrentConfig.FLOAT_PRECISION
-        self.assertAlmostEqual(tq_account.balance, my_account.balance, places=6, msg="账户余额不一致")
-        self.assertAlmostEqual(tq_account.available, my_account.available, places=6, msg="可用资金不一致")
+    async def test_account_data_consistency(self):
+        """测试账户数据一致性"""
+        self._test_account_data_consistency()
 
         self.logger.info("账户数据一致性验证通过")
         self.test_passed = True
 
-    def test_position_data_consistency(self):
+    async def test_position_data_consistency(self):
         """测试持仓数据一致性"""
-        asyncio.run(self._test_position_data_consistency_async())
-
-    async def _test_position_data_consistency_async(self):
-        """异步的持仓数据一致性测试"""
-        await self._initialize_data_manager()
-
-        test_symbol = CurrentConfig.TEST_SYMBOL
-        tq_position = self.data_manager.tq_positions.get(test_symbol)
-        self.assertIsNotNone(tq_position, f"天勤持仓对象不应为None（合约: {test_symbol}）")
-
-        my_long_position = self.data_manager.get_position(test_symbol, "LONG")
-        my_short_position = self.data_manager.get_position(test_symbol, "SHORT")
+        self._test_position_data_consistency()
 
-        self.assertIsNotNone(my_long_position, "自定义多头持仓对象不应为None")
-        self.assertIsNotNone(my_short_position, "自定义空头持仓对象不应为None")
+        self.logger.info("持仓数据一致性验证通过")
+        self.test_passed = True
 
-        tq_long_volume = tq_position.pos_long_his + tq_position.pos_long_today
-        self.assertEqual(tq_long_volume, my_long_position.volume, "多头持仓手数不一致")
+    async def test_order_data_consistency(self):
+        """测试委托单数据一致性（全部委托单）"""
+        self._test_order_data_consistency()
+        self.logger.info("委托单数据一致性验证通过（共%d个）", len(self.data_manager.my_orders))
+        self.test_passed = True
 
-        tq_short_volume = tq_position.pos_short_his + tq_position.pos_short_today
-        self.assertEqual(tq_short_volume, my_short_position.volume, "空头持仓手数不一致")
+    async def test_trade_data_consistency(self):
+        """测试成交记录数据一致性（全部成交记录）"""
+        self._test_trade_data_consistency()
+        self.logger.info("成交记录数据一致性验证通过（共%d条）", len(self.data_manager.my_trades))
+        self.test_passed = True
 
-        self.logger.info("持仓数据一致性验证通过")
+    async def test_manager_consistency_report(self):
+        """测试数据管理器自带的一致性校验：账户、持仓、委托单、成交记录均应一致"""
+        report = self.data_manager.validate_data_consistency()
+        for table, consistent in report.items():
+            with self.subTest(table=table):
+                self.assertTrue(consistent, f"数据管理器校验不一致: {table}")
+        self.logger.info("数据管理器一致性校验通过: %s", report)
         self.test_passed = True
 
 
 class TestRealTimeUpdates(BaseTQSdkIntegration):
     """实时更新测试类"""
 
-    def test_real_time_data_sync(self):
-        """测试实时数据同步"""
-        asyncio.run(self._test_real_time_data_sync_async())
-
-    async def _test_real_time_data_sync_async(self):
-        """异步的实时数据同步测试"""
-        await self._initialize_data_manager()
-
-        update_count = 0
+    async def test_real_time_data_sync(self):
+        """测试实时数据同步：启动同步循环后 update_count 应持续增长"""
+        data_manager = self.data_manager
+        initial_count = data_manager.update_count
+        received = 0
         max_updates = 5
-        start_time = time.time()
+        deadline = time.time() + self.TEST_DURATION
 
         self.logger.info("开始实时数据同步测试...")
 
-        while update_count < max_updates and time.time() - start_time < self.TEST_DURATION:
-            try:
-                await asyncio.sleep(1)  # 简化等待逻辑
-                update_count += 1
-                self.log_progress(f"收到第{update_count}次数据更新")
-            except Exception as e:
-                self.fail(f"实时数据同步过程中发生错误: {e}")
-
-        self.assertGreaterEqual(update_count, 2, "至少应完成2次数据更新")
-        self.logger.info(f"实时数据同步测试通过（共处理{update_count}次更新）")
+        data_manager._start_sync_task()
+        try:
+            while received < max_updates and time.time() < deadline:
+                if await data_manager._wait_for_update(timeout=5.0):
+                    received += 1
+                    if received % 5 == 0:
+                        # 每5次更新汇总记录一次进度
+                        self.log_progress("已收到%d次数据更新", received)
+        finally:
+            await data_manager._stop_sync_task()
+
+        self.assertGreaterEqual(received, 2, "至少应完成2次数据更新")
+        self.assertGreater(data_manager.update_count, initial_count, "数据同步后 update_count 应增长")
+        self.logger.info("实时数据同步测试通过（共处理%d次更新）", received)
         self.test_passed = True
 
 
 class TestStopLossFunctionality(BaseTQSdkIntegration):
     """止损功能测试类"""
 
-    def test_stop_loss_condition_detection(self):
+    async def test_stop_loss_condition_detection(self):
         """测试止损条件检测"""
-        asyncio.run(self._test_stop_loss_condition_detection_async())
-
-    async def _test_stop_loss_condition_detection_async(self):
-        """异步的止损条件检测测试"""
-        await self._initialize_data_manager()
-
         my_account = self.data_manager.get_account()
         self.assertIsNotNone(my_account, "自定义账户对象不应为None")
 
-        stop_loss_ratio = CurrentConfig.RISK_MANAGEMENT["STOP_LOSS_RATIO"]
+        stop_loss_ratio = _STOP_LOSS
         initial_balance = my_account.balance
         float_profit = my_account.pnl if hasattr(my_account, 'pnl') else 0
 
@@ -261,27 +366,35 @@ class TestStopLossFunctionality(BaseTQSdkIntegration):
             current_return = float_profit / initial_balance
             should_stop_loss = current_return <= stop_loss_ratio
 
-            self.logger.info(f"账户初始权益: {initial_balance:.2f}")
-            self.logger.info(f"当前浮动盈亏: {float_profit:.2f}")
-            self.logger.info(f"当前收益率: {current_return:.4%}")
-            self.logger.info(f"止损阈值: {stop_loss_ratio:.4%}")
-            self.logger.info(f"是否触发止损: {should_stop_loss}")
+            self.logger.info("账户初始权益: %.2f", initial_balance)
+            self.logger.info("当前浮动盈亏: %.2f", float_profit)
+            self.logger.info("当前收益率: %.4f%%", current_return * 100)
+            self.logger.info("止损阈值: %.4f%%", stop_loss_ratio * 100)
+            self.logger.info("是否触发止损: %s", should_stop_loss)
 
         self.test_passed = True
 
 
+# 按顺序运行的测试类：所有测试类登录同一个天勤账户，在同一进程中依次运行，
+# 共用 setUpModule 建立的一个连接（并行运行会同时登录同一账户）
+TEST_CASES = (
+    TestTQSdkIntegration,
+    TestDataConsistency,
+    TestRealTimeUpdates,
+    TestStopLossFunctionality,
+)
+
+
 def main():
-    """主函数"""
-    # 创建测试加载器
-    loader = unittest.TestLoader()
+    """主函数：在当前进程中依次运行所有测试类"""
+    _configure_logging()
+    if not RUN_STRATEGY_TEST:
+        _LOGGER.info("跳过耗时的策略测试: TestTQSdkIntegration（设置 RUN_STRATEGY_TEST=1 启用）")
 
     # 只加载以Test开头的类，避免加载BaseTQSdkIntegration
-    test_suite = loader.loadTestsFromTestCase(TestTQSdkIntegration)
-    test_suite.addTests(loader.loadTestsFromTestCase(TestDataConsistency))
-    test_suite.addTests(loader.loadTestsFromTestCase(TestRealTimeUpdates))
-    test_suite.addTests(loader.loadTestsFromTestCase(TestStopLossFunctionality))
+    loader = unittest.TestLoader()
+    test_suite = unittest.TestSuite(loader.loadTestsFromTestCase(case) for case in TEST_CASES)
 
-    # 运行测试
     runner = unittest.TextTestRunner(verbosity=2, stream=sys.stdout)
     result = runner.run(test_suite)
 
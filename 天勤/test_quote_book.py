@@ -0,0 +1,316 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+价格缓冲区与均线计算的离线测试 - 不连接天勤API
+覆盖内容：
+1. QuoteBook 环形缓冲区的写入、回绕读取和按分发去重
+2. 双均线策略增量SMA/EMA与直接计算结果一致
+3. 多个策略共享同一合约缓冲区时的均线正确性
+4. 用历史收盘价预热均线
+5. 均线交叉信号的反手下单（先平反方向持仓再开仓）
+6. 策略日志级别的解析
+"""
+
+import io
+import logging
+import unittest
+from contextlib import redirect_stdout
+from types import SimpleNamespace
+
+import numpy as np
+
+from trading_strategies import QUOTE_BOOK, QuoteBook, DoubleMaStrategy, _backfill_sma
+
+
+def _quote(price: float) -> SimpleNamespace:
+    """构造只含策略用到字段的行情对象（盘中 close 为 NaN）"""
+    return SimpleNamespace(last_price=price, close=float("nan"))
+
+
+def _prices(count: int, seed: int = 7) -> np.ndarray:
+    """生成确定性的随机价格序列"""
+    return 3000.0 + np.random.default_rng(seed).normal(0.0, 5.0, count).cumsum()
+
+
+_symbol_seq = 0
+
+
+def _new_strategy(symbol: str = None, **config) -> DoubleMaStrategy:
+    """创建策略；未指定合约时使用新的合约名，使各测试在共享缓冲区中互不影响"""
+    global _symbol_seq
+    if symbol is None:
+        _symbol_seq += 1
+        symbol = f"TEST.ma{_symbol_seq}"
+    config = {"symbol": symbol, "short_period": 5, "long_period": 20, **config}
+    return DoubleMaStrategy(config)
+
+
+class TestQuoteBook(unittest.TestCase):
+    """QuoteBook 环形缓冲区测试"""
+
+    def setUp(self):
+        self.book = QuoteBook()
+        self.sid = self.book.register("SHFE.cu2410")
+
+    def test_register_returns_same_row(self):
+        """同一合约重复登记返回原行号，不同合约分配新行"""
+        self.assertEqual(self.book.register("SHFE.cu2410"), self.sid)
+        self.assertEqual(self.book.register("SHFE.rb2410"), self.sid + 1)
+
+    def test_recent_after_wraparound(self):
+        """写入超过 RING_LEN 条价格后，recent/price_at 按时间顺序返回最近的价格"""
+        prices = _prices(QuoteBook.RING_LEN + 37)
+        for price in prices:
+            self.book.push(self.sid, price)
+
+        np.testing.assert_array_equal(self.book.recent(self.sid, 10), prices[-10:])
+        np.testing.assert_array_equal(self.book.recent(self.sid, QuoteBook.RING_LEN), prices[-QuoteBook.RING_LEN:])
+        last = len(prices) - 1
+        self.assertEqual(self.book.price_at(self.sid, last), prices[-1])
+        self.assertEqual(self.book.price_at(self.sid, last - QuoteBook.RING_LEN + 1), prices[-QuoteBook.RING_LEN])
+
+    def test_push_dedupes_within_dispatch(self):
+        """同一次分发中只写入一次，下一次分发重新写入"""
+        self.book.begin_dispatch("SHFE.cu2410")
+        first = self.book.push(self.sid, 1.0, dispatched=True)
+        second = self.book.push(self.sid, 1.0, dispatched=True)
+        self.assertEqual(first, second)
+        self.assertEqual(int(self.book.write_idx[self.sid]), 1)
+
+        self.book.begin_dispatch("SHFE.cu2410")
+        self.assertEqual(self.book.push(self.sid, 1.0, dispatched=True), first + 1)
+
+    def test_push_without_dispatch_always_writes(self):
+        """没有经过数据管理器分发（如直接调用策略回调、历史预热）时每次都写入"""
+        for i in range(3):
+            self.assertEqual(self.book.push(self.sid, 1.0, dispatched=True), i)
+        self.assertEqual(self.book.push(self.sid, 2.0), 3)
+
+
+class TestMovingAverage(unittest.IsolatedAsyncioTestCase):
+    """双均线策略均线计算测试"""
+
+    async def test_backfill_sma_matches_direct_mean(self):
+        """累加和计算的SMA序列与逐窗口求均值一致"""
+        prices = _prices(50)
+        expected = [prices[i - 9:i + 1].mean() for i in range(9, len(prices))]
+        np.testing.assert_allclose(_backfill_sma(prices, 10), expected, rtol=1e-12)
+
+    async def test_incremental_sma_across_wraparound(self):
+        """增量SMA在缓冲区回绕后仍与直接计算一致"""
+        strategy = _new_strategy()
+        await strategy.start()
+        prices = _prices(QuoteBook.RING_LEN + 100)
+        for price in prices:
+            strategy.on_market_data(strategy.symbol, _quote(price))
+        await strategy.stop()
+
+        self.assertAlmostEqual(strategy.short_ma, prices[-5:].mean(), places=6)
+        self.assertAlmostEqual(strategy.long_ma, prices[-20:].mean(), places=6)
+
+    async def test_incremental_ema(self):
+        """增量EMA与按定义递推的结果一致"""
+        strategy = _new_strategy(ma_type="EMA")
+        await strategy.start()
+        prices = _prices(200)
+        for price in prices:
+            strategy.on_market_data(strategy.symbol, _quote(price))
+        await strategy.stop()
+
+        alpha = 2.0 / (20 + 1)
+        expected = prices[0]
+        for price in prices[1:]:
+            expected += alpha * (price - expected)
+        self.assertAlmostEqual(strategy.long_ma, expected, places=6)
+
+    async def test_nan_ticks_are_skipped(self):
+        """最新价为NaN的行情不参与均线计算"""
+        strategy = _new_strategy()
+        await strategy.start()
+        prices = _prices(30)
+        for price in prices:
+            strategy.on_market_data(strategy.symbol, _quote(price))
+            strategy.on_market_data(strategy.symbol, _quote(float("nan")))
+        await strategy.stop()
+
+        self.assertEqual(strategy._bars_seen, len(prices))
+        self.assertAlmostEqual(strategy.long_ma, prices[-20:].mean(), places=6)
+
+    async def test_shared_symbol_strategies_see_each_tick_once(self):
+        """同一合约的两个策略共享缓冲区：每次分发只写入一次价格，两者均线都正确"""
+        fast = _new_strategy()
+        slow = _new_strategy(symbol=fast.symbol, short_period=10, long_period=40)
+        await fast.start()
+        await slow.start()
+        prices = _prices(300)
+        for price in prices:
+            QUOTE_BOOK.begin_dispatch(fast.symbol)
+            fast.on_market_data(fast.symbol, _quote(price))
+            slow.on_market_data(slow.symbol, _quote(price))
+        await fast.stop()
+        await slow.stop()
+
+        self.assertEqual(int(QUOTE_BOOK.write_idx[fast._sid]), len(prices))
+        self.assertAlmostEqual(fast.long_ma, prices[-20:].mean(), places=6)
+        self.assertAlmostEqual(slow.short_ma, prices[-10:].mean(), places=6)
+        self.assertAlmostEqual(slow.long_ma, prices[-40:].mean(), places=6)
+
+    async def test_long_period_must_be_below_ring_len(self):
+        """长周期不小于缓冲区长度时拒绝创建策略"""
+        with self.assertRaises(ValueError):
+            _new_strategy(long_period=QuoteBook.RING_LEN)
+        _new_strategy(long_period=QuoteBook.RING_LEN - 1)
+
+
+class TestWarmUp(unittest.IsolatedAsyncioTestCase):
+    """双均线策略历史预热测试"""
+
+    async def test_nan_history_is_dropped(self):
+        """历史收盘价开头的NaN不写入缓冲区，预热后的均线和之后的增量更新均有效"""
+        prices = _prices(100)
+        strategy = _new_strategy(history_closes=np.concatenate((np.full(5, np.nan), prices)))
+        await strategy.start()
+
+        self.assertEqual(int(QUOTE_BOOK.write_idx[strategy._sid]), len(prices))
+        self.assertAlmostEqual(strategy.short_ma, prices[-5:].mean(), places=6)
+        self.assertAlmostEqual(strategy.long_ma, prices[-20:].mean(), places=6)
+
+        live = _prices(50, seed=11)
+        for price in live:
+            strategy.on_market_data(strategy.symbol, _quote(price))
+        await strategy.stop()
+        self.assertAlmostEqual(strategy.long_ma, live[-20:].mean(), places=6)
+
+    async def test_insufficient_history(self):
+        """剔除NaN后不足长周期时不完成预热"""
+        strategy = _new_strategy()
+        closes = np.concatenate((np.full(10, np.nan), _prices(19)))
+        self.assertFalse(strategy.warm_up(closes))
+        self.assertEqual(strategy._bars_seen, 0)
+
+    async def test_ema_seeded_with_sma(self):
+        """EMA模式以同周期SMA作为初始值，之后按EMA递推"""
+        prices = _prices(60)
+        strategy = _new_strategy(ma_type="EMA", history_closes=prices)
+        await strategy.start()
+        self.assertAlmostEqual(strategy.short_ma, prices[-5:].mean(), places=6)
+        self.assertAlmostEqual(strategy.long_ma, prices[-20:].mean(), places=6)
+
+        expected = prices[-20:].mean()
+        strategy.on_market_data(strategy.symbol, _quote(3100.0))
+        await strategy.stop()
+        expected += 2.0 / (20 + 1) * (3100.0 - expected)
+        self.assertAlmostEqual(strategy.long_ma, expected, places=6)
+
+    async def test_cross_side_seeded(self):
+        """预热后按短、长均线的相对位置设置交叉方向：上涨行情短均线在上方，下跌行情在下方"""
+        rising = _new_strategy()
+        rising.warm_up(np.arange(1.0, 41.0))
+        self.assertEqual(rising._cross_side, 1)
+
+        falling = _new_strategy()
+        falling.warm_up(np.arange(40.0, 0.0, -1.0))
+        self.assertEqual(falling._cross_side, -1)
+
+    async def test_filled_book_ignores_history(self):
+        """缓冲区已有同合约其他策略写入的价格时，忽略传入的历史收盘价，直接使用缓冲区"""
+        first = _new_strategy()
+        prices = _prices(40)
+        first.warm_up(prices)
+
+        second = _new_strategy(symbol=first.symbol, short_period=10, long_period=30)
+        self.assertTrue(second.warm_up(np.full(40, 1.0)))
+        self.assertEqual(int(QUOTE_BOOK.write_idx[second._sid]), len(prices))
+        self.assertAlmostEqual(second.short_ma, prices[-10:].mean(), places=6)
+        self.assertAlmostEqual(second.long_ma, prices[-30:].mean(), places=6)
+
+
+def _position(**volumes) -> SimpleNamespace:
+    """构造天勤持仓对象的替身，未给出的手数为0"""
+    fields = ("pos_long_today", "pos_long_his", "pos_short_today", "pos_short_his",
+              "volume_long_frozen_today", "volume_long_frozen_his",
+              "volume_short_frozen_today", "volume_short_frozen_his")
+    return SimpleNamespace(**{name: volumes.get(name, 0) for name in fields})
+
+
+class _FakeDataManager:
+    """只记录委托的数据管理器替身"""
+
+    def __init__(self, position: SimpleNamespace):
+        self.position = position
+        self.orders = []
+
+    def get_tq_position(self, symbol: str) -> SimpleNamespace:
+        return self.position
+
+    async def place_order(self, symbol, direction, volume, price_type, price, offset):
+        self.orders.append((direction, offset, volume))
+        return f"o{len(self.orders)}"
+
+
+class TestReverseOrders(unittest.IsolatedAsyncioTestCase):
+    """双均线策略交叉信号下单测试"""
+
+    async def _signal(self, symbol: str, direction: str, position: SimpleNamespace, **config) -> list:
+        """在给定持仓下处理一次交叉信号，返回提交的 (方向, 开平, 手数)"""
+        strategy = _new_strategy(symbol=symbol, volume=2, **config)
+        data_manager = _FakeDataManager(position)
+        strategy.set_data_manager(data_manager)
+        await strategy.start()
+        await strategy._check_trading_signal(direction)
+        await strategy.stop()
+        return data_manager.orders
+
+    async def test_open_without_opposite_position(self):
+        """没有反方向持仓时只开仓"""
+        orders = await self._signal("SHFE.cu2410", "SELL", _position(pos_long_today=0))
+        self.assertEqual(orders, [("SELL", "OPEN", 2)])
+
+    async def test_shfe_closes_today_and_history_separately(self):
+        """上期所合约分别平今、平昨，冻结的手数不参与平仓，然后反手开仓"""
+        position = _position(pos_short_today=3, pos_short_his=2, volume_short_frozen_today=1)
+        orders = await self._signal("SHFE.cu2410", "BUY", position)
+        self.assertEqual(orders, [("BUY", "CLOSETODAY", 2), ("BUY", "CLOSE", 2), ("BUY", "OPEN", 2)])
+
+    async def test_other_exchange_closes_in_one_order(self):
+        """其他交易所用一笔 CLOSE 平掉全部反方向持仓"""
+        orders = await self._signal("DCE.m2501", "SELL", _position(pos_long_today=1, pos_long_his=2))
+        self.assertEqual(orders, [("SELL", "CLOSE", 3), ("SELL", "OPEN", 2)])
+
+    async def test_batch_mode_keeps_offsets(self):
+        """批量下单模式下 flush_orders 提交的委托保留开平标志"""
+        orders = await self._signal("SHFE.cu2410", "BUY", _position(pos_short_his=1), batch_orders=True)
+        self.assertEqual(orders, [("BUY", "CLOSE", 1), ("BUY", "OPEN", 2)])
+
+
+class TestStrategyLog(unittest.TestCase):
+    """策略日志级别解析测试"""
+
+    def setUp(self):
+        self.strategy = _new_strategy()
+        self.strategy.set_data_manager(SimpleNamespace(logger=logging.getLogger("TestStrategyLog")))
+
+    def test_level_names_and_numbers(self):
+        """大小写级别名称、CRITICAL 和自定义整数级别都能记录"""
+        with self.assertLogs("TestStrategyLog", level=1) as captured:
+            self.strategy._log("a", "warning")
+            self.strategy._log("b", "CRITICAL")
+            self.strategy._log("c", logging.CRITICAL)
+            self.strategy._log("d", 25)
+            self.strategy._log("e", "verbose")
+        levels = [record.levelno for record in captured.records]
+        self.assertEqual(levels, [logging.WARNING, logging.CRITICAL, logging.CRITICAL, 25, logging.INFO])
+        self.assertTrue(all(record.getMessage().startswith("[DoubleMaStrategy] ") for record in captured.records))
+
+    def test_without_data_manager_logger(self):
+        """未设置数据管理器时写入标准输出，小写级别名称和自定义整数级别同样可用"""
+        strategy = _new_strategy()
+        output = io.StringIO()
+        with redirect_stdout(output):
+            strategy._log("x", "error")
+            strategy._log("y", 25)
+        self.assertEqual(output.getvalue(), "ERROR: [DoubleMaStrategy] x\nLevel 25: [DoubleMaStrategy] y\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,10 @@
 # my_tqsdk_tables/trade.py
 
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Optional, Tuple
+
+# 天勤成交方向 -> vn.py风格取值
+_DIR_MAP = {"BUY": "LONG", "SELL": "SHORT"}
 
 
 class MyTrade:
@@ -11,6 +14,11 @@ class MyTrade:
     成交记录是交易系统中不可变的原子事实，结构相对简单。
     """
 
+    __slots__ = ("gateway_name", "tradeid", "vt_tradeid",
+                 "orderid", "vt_orderid", "exchange_tradeid",
+                 "symbol", "exchange", "vt_symbol",
+                 "direction", "offset", "price", "volume", "datetime_ns")
+
     def __init__(self, gateway_name: str = "", tradeid: str = ""):
         """
         初始化成交记录对象。
@@ -39,7 +47,7 @@ class MyTrade:
         self.offset: str = "NONE"  # 开平: "OPEN" / "CLOSE" / "CLOSETODAY"
         self.price: float = float("nan")  # 成交价格
         self.volume: int = 0  # 成交数量
-        self.datetime: Optional[datetime] = None  # 成交时间
+        self.datetime_ns: int = 0  # 成交时间（纳秒时间戳），读取 datetime 时才转换
 
     def update_from_tqsdk(self, tqsdk_trade) -> None:
         """
@@ -58,15 +66,31 @@ class MyTrade:
         self.vt_symbol = f"{self.symbol}.{self.exchange}"
 
         # 2. 更新成交详情
-        self.direction = "LONG" if tqsdk_trade.direction == "BUY" else "SHORT"
+        self.direction = _DIR_MAP.get(tqsdk_trade.direction, "SHORT")
         self.offset = tqsdk_trade.offset
         self.price = tqsdk_trade.price
         self.volume = tqsdk_trade.volume
 
-        # 3. 更新时间（将纳秒时间戳转换为datetime）
-        if tqsdk_trade.trade_date_time > 0:
-            # 将纳秒时间戳转换为秒，然后创建datetime对象
-            self.datetime = datetime.fromtimestamp(tqsdk_trade.trade_date_time / 1e9)
+        # 3. 更新时间（只保存纳秒时间戳，datetime对象按需生成）
+        self.datetime_ns = tqsdk_trade.trade_date_time
+
+    @property
+    def datetime(self) -> Optional[datetime]:
+        """成交时间：由纳秒时间戳按需转换，未成交时间为None"""
+        if self.datetime_ns > 0:
+            return datetime.fromtimestamp(self.datetime_ns / 1e9)
+        return None
+
+    @classmethod
+    def bulk_update_from_tqsdk(cls, pairs: Iterable[Tuple["MyTrade", object]]) -> None:
+        """
+        批量更新方法：一次同步多条新成交，逐条调用 update_from_tqsdk，字段映射只在一处维护。
+
+        Args:
+            pairs: (MyTrade, 天勤Trade) 二元组的可迭代对象。
+        """
+        for trade, tqsdk_trade in pairs:
+            trade.update_from_tqsdk(tqsdk_trade)
 
     def __repr__(self) -> str:
         """用于打印对象的易读信息，便于调试。"""
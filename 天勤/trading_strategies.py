@@ -7,12 +7,154 @@
 """
 
 import asyncio
-from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+import logging
+import math
+import sys
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-class BaseTradingStrategy(ABC):
+# numpy是tqsdk本身的必需依赖，安装了tqsdk即可使用，这里直接导入；numba仍为可选依赖
+import numpy as np
+
+from _njit import njit
+
+try:
+    import uvloop
+except ImportError:  # uvloop为可选依赖（不支持Windows），未安装时使用标准事件循环
+    uvloop = None
+
+
+def install_uvloop() -> bool:
+    """
+    把全局事件循环策略切换为uvloop，之后新建的事件循环均基于libuv实现
+
+    Returns:
+        bool: 是否已切换（未安装uvloop时返回False，保持标准事件循环）
+    """
+    if uvloop is None:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+# 下单方向、开平与价格类型常量，统一引用同一个字符串对象，下游可直接用 is 比较
+_BUY = sys.intern("BUY")
+_SELL = sys.intern("SELL")
+_OPEN = sys.intern("OPEN")
+_CLOSE = sys.intern("CLOSE")
+_CLOSETODAY = sys.intern("CLOSETODAY")
+_LIMIT = sys.intern("LIMIT")
+_MARKET = sys.intern("MARKET")
+
+# 平今、平昨需要分别下单的交易所，其他交易所的 CLOSE 指令由交易所按规则先平今仓
+_CLOSETODAY_EXCHANGES = frozenset(("SHFE", "INE"))
+
+# 日志级别名称 -> logging整数级别，_log 同时接受两种写法
+_LEVEL_INT = {"DEBUG": logging.DEBUG, "INFO": logging.INFO, "WARNING": logging.WARNING, "ERROR": logging.ERROR,
+              "CRITICAL": logging.CRITICAL}
+
+
+def _print_log_fns() -> Dict[Union[str, int], Any]:
+    """未设置数据管理器时使用的日志函数：按级别写入标准输出（不逐行刷新，解释器退出时会写出缓冲区中剩余的内容）"""
+    fns = {}
+    for name, level in _LEVEL_INT.items():
+        prefix = f"{name}: "
+        fns[name] = fns[level] = (lambda message, _prefix=prefix: sys.stdout.write(_prefix + message + "\n"))
+    return fns
+
+
+def _backfill_sma(prices: np.ndarray, n: int) -> np.ndarray:
+    """用累加和一次算出整段价格的n周期简单移动平均序列（长度为 len(prices) - n + 1）"""
+    c = np.cumsum(prices, dtype=np.float64)
+    c[n:] = c[n:] - c[:-n]
+    return c[n - 1:] / n
+
+
+# 均线内核给出显式签名，安装numba时在模块导入阶段即完成编译（并缓存到磁盘），
+# 避免第一笔行情到来时才触发JIT编译造成的停顿
+@njit("f8(f8, f8, f8, i8)", cache=True, fastmath=True)
+def _sma_update(prev_sma: float, new_px: float, old_px: float, window: int) -> float:
+    """增量简单移动平均：窗口滑动一格，加上新价格、减去移出窗口的旧价格"""
+    return prev_sma + (new_px - old_px) / window
+
+
+@njit("f8(f8, f8, f8)", cache=True, fastmath=True)
+def _ema_update(prev_ema: float, px: float, alpha: float) -> float:
+    """指数移动平均：EMA_t = EMA_{t-1} + alpha * (P_t - EMA_{t-1})"""
+    return prev_ema + alpha * (px - prev_ema)
+
+
+class QuoteBook:
+    """
+    按合约共享的收盘价环形缓冲区：所有合约的价格存放在同一个二维float64数组中（每个合约一行），
+    write_idx 记录各合约累计写入的价格数。订阅同一合约的多个策略共用一份价格窗口，不再各自复制
+    """
+
+    RING_LEN = 1024  # 每个合约保留的最近价格数，策略的均线周期必须小于该长度
+
+    def __init__(self):
+        self.symbol_to_id: Dict[str, int] = {}
+        self.closes = np.zeros((0, self.RING_LEN), dtype=np.float64)
+        self.write_idx = np.zeros(0, dtype=np.int64)
+        # 各合约当前的行情分发序号，以及最近一次写入价格时的分发序号
+        self._dispatch_seq: List[int] = []
+        self._written_seq: List[int] = []
+
+    def register(self, symbol: str) -> int:
+        """登记合约并返回其行号（已登记的合约直接返回原行号）"""
+        sid = self.symbol_to_id.get(symbol)
+        if sid is None:
+            sid = self.symbol_to_id[symbol] = len(self._dispatch_seq)
+            self.closes = np.vstack((self.closes, np.zeros((1, self.RING_LEN), dtype=np.float64)))
+            self.write_idx = np.append(self.write_idx, 0)
+            self._dispatch_seq.append(0)
+            self._written_seq.append(0)
+        return sid
+
+    def begin_dispatch(self, symbol: str):
+        """数据管理器每次向策略分发某合约的行情前调用一次，为本次分发分配新的序号"""
+        sid = self.symbol_to_id.get(symbol)
+        if sid is not None:
+            self._dispatch_seq[sid] += 1
+
+    def push(self, sid: int, price: float, dispatched: bool = False) -> int:
+        """
+        写入一条价格，返回该价格的累计序号
+
+        dispatched 为真表示价格来自数据管理器的一次行情分发：同一次分发中订阅该合约的
+        其他策略已经写入时不再重复写入，直接返回已写入价格的序号
+        """
+        n = int(self.write_idx[sid])
+        if dispatched:
+            seq = self._dispatch_seq[sid]
+            if seq and seq == self._written_seq[sid]:
+                return n - 1
+            self._written_seq[sid] = seq
+        self.closes[sid, n % self.RING_LEN] = price
+        self.write_idx[sid] = n + 1
+        return n
+
+    def price_at(self, sid: int, pos: int) -> float:
+        """读取合约第 pos 条价格（只保证最近 RING_LEN 条有效）"""
+        return self.closes[sid, pos % self.RING_LEN]
+
+    def recent(self, sid: int, count: int) -> np.ndarray:
+        """按时间顺序取出合约最近 count 条价格（不超过已写入条数和 RING_LEN）"""
+        n = int(self.write_idx[sid])
+        count = min(count, n, self.RING_LEN)
+        return self.closes[sid, np.arange(n - count, n) % self.RING_LEN]
+
+
+# 模块内所有策略共用的价格缓冲区
+QUOTE_BOOK = QuoteBook()
+
+
+class BaseTradingStrategy:
     """交易策略基类 - 修复版本"""
 
+    # 策略对象长期存在且在每笔行情中被频繁访问，使用__slots__去掉实例字典
+    __slots__ = ("name", "data_manager", "is_running", "config", "orders_created", "trades_executed",
+                 "_log_prefix", "_log_fns", "_signal_event", "_order_queue", "_loop",
+                 "_on_md", "_on_ou", "_on_tu")
+
     def __init__(self, name: str, config: Dict[str, Any] = None):
         self.name = name
         self.data_manager = None
@@ -20,22 +162,43 @@ class BaseTradingStrategy(ABC):
         self.config = config or {}
         self.orders_created = 0
         self.trades_executed = 0
+        # 日志前缀和各级别日志函数只在初始化/设置数据管理器时解析一次
+        self._log_prefix = f"[{name}] "
+        self._log_fns = _print_log_fns()
+        # 策略产生足够行情或首笔成交后置位，供外部等待策略“有结果”而非固定休眠
+        self._signal_event = asyncio.Event()
+        # 批量下单模式（config["batch_orders"]为真）下暂存的委托，由 flush_orders 并发提交
+        self._order_queue: List[tuple] = []
+        # 策略运行所在的事件循环，在 start 中获取一次，供定时回调使用
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # 预先绑定回调，数据管理器分发时直接调用，省去每笔行情的方法查找
+        self._on_md = self.on_market_data
+        self._on_ou = self.on_order_update
+        self._on_tu = self.on_trade_update
 
     def set_data_manager(self, data_manager):
-        """设置数据管理器引用"""
+        """设置数据管理器引用，并解析出各级别日志函数供 _log 直接调用"""
         self.data_manager = data_manager
+        logger = getattr(data_manager, 'logger', None)
+        if logger is None:
+            self._log_fns = _print_log_fns()
+        else:
+            self._log_fns = {}
+            for name, level in _LEVEL_INT.items():
+                self._log_fns[name] = self._log_fns[level] = getattr(logger, name.lower())
 
     async def start(self):
         """启动策略 - 修复：不再调用不存在的super().start()"""
         self.is_running = True
-        self._log(f"策略 {self.name} 已启动")
+        self._loop = asyncio.get_running_loop()
+        self._log("策略已启动")
         # 策略特定的启动逻辑由子类实现
         await self.on_start()
 
     async def stop(self):
         """停止策略"""
         self.is_running = False
-        self._log(f"策略 {self.name} 已停止")
+        self._log("策略已停止")
         # 策略特定的停止逻辑由子类实现
         await self.on_stop()
 
@@ -47,104 +210,304 @@ class BaseTradingStrategy(ABC):
         """策略停止时的自定义逻辑 - 子类可重写"""
         pass
 
-    @abstractmethod
-    async def on_market_data(self, symbol: str, quote_data: Any):
-        """行情数据回调 - 子类必须实现"""
+    # 以下三个回调可重写为普通函数或协程函数：不需要await的回调写成普通函数，
+    # 数据管理器直接调用，省去每次事件创建协程对象的开销
+
+    def on_market_data(self, symbol: str, quote_data: Any):
+        """行情数据回调 - 子类可重写"""
         pass
 
-    @abstractmethod
-    async def on_order_update(self, order_data: Any):
-        """订单更新回调 - 子类必须实现"""
+    def on_order_update(self, order_data: Any):
+        """订单更新回调 - 子类可重写"""
         pass
 
-    @abstractmethod
-    async def on_trade_update(self, trade_data: Any):
-        """成交更新回调 - 子类必须实现"""
+    def on_trade_update(self, trade_data: Any):
+        """成交更新回调 - 子类可重写"""
         pass
 
     async def place_order(self, symbol: str, direction: str, volume: int, 
-                         price_type: str = "LIMIT", price: float = None) -> Optional[str]:
-        """下单接口"""
+                         price_type: str = _LIMIT, price: float = None,
+                         offset: str = _OPEN) -> Optional[str]:
+        """下单接口（批量下单模式下只加入队列并返回None，由 flush_orders 统一提交）"""
+        if self.config.get("batch_orders"):
+            self._order_queue.append((symbol, direction, volume, price_type, price, offset))
+            return None
+
         if not self.data_manager:
-            self._log("错误: 未设置数据管理器，无法下单", level="ERROR")
+            self._log("错误: 未设置数据管理器，无法下单", level=logging.ERROR)
             return None
 
         try:
             order_id = await self.data_manager.place_order(
-                symbol, direction, volume, price_type, price
+                symbol, direction, volume, price_type, price, offset
             )
             return order_id
         except Exception as e:
-            self._log(f"下单失败: {e}", level="ERROR")
+            self._log(f"下单失败: {e}", level=logging.ERROR)
             return None
 
-    def _log(self, message: str, level: str = "INFO"):
-        """日志记录"""
-        if hasattr(self, 'data_manager') and self.data_manager and hasattr(self.data_manager, 'logger'):
-            getattr(self.data_manager.logger, level.lower())(message)
-        else:
-            print(f"{level}: {message}")
+    async def flush_orders(self, max_workers: int = 10) -> List[Optional[str]]:
+        """
+        并发提交队列中的全部委托，同时在途的下单请求不超过 max_workers 个
+
+        Returns:
+            List[Optional[str]]: 与提交顺序对应的订单号，下单失败的位置为None
+        """
+        if not self._order_queue:
+            return []
+        orders, self._order_queue = self._order_queue, []
+        if not self.data_manager:
+            self._log("错误: 未设置数据管理器，无法下单", level=logging.ERROR)
+            return [None] * len(orders)
+
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def submit(order):
+            async with semaphore:
+                return await self.data_manager.place_order(*order)
+
+        results = await asyncio.gather(*(submit(order) for order in orders), return_exceptions=True)
+        order_ids = []
+        for result in results:
+            if isinstance(result, Exception):
+                self._log(f"下单失败: {result}", level=logging.ERROR)
+                order_ids.append(None)
+            else:
+                order_ids.append(result)
+        return order_ids
+
+    def _log(self, message: str, level: Union[str, int] = logging.INFO):
+        """日志记录：调用预先解析好的日志函数，消息带策略名前缀"""
+        log_fn = self._log_fns.get(level)
+        if log_fn is None:
+            log_fn = self._log_fns[level] = self._resolve_log_fn(level)
+        log_fn(self._log_prefix + message)
+
+    def _resolve_log_fn(self, level: Union[str, int]) -> Any:
+        """
+        解析预先登记之外的日志级别（小写名称如 "warning"、自定义整数级别等），
+        结果由 _log 缓存；无法识别的级别名称按INFO记录
+        """
+        if isinstance(level, str):
+            log_fn = self._log_fns.get(level.upper())
+            if log_fn is not None:
+                return log_fn
+            level = logging.getLevelName(level.upper())
+            if not isinstance(level, int):
+                level = logging.INFO
+        logger = getattr(self.data_manager, 'logger', None)
+        if logger is not None:
+            return lambda message: logger.log(level, message)
+        prefix = f"{logging.getLevelName(level)}: "
+        return lambda message: sys.stdout.write(prefix + message + "\n")
+
 
 class DoubleMaStrategy(BaseTradingStrategy):
     """双均线策略 - 修复版本"""
 
+    __slots__ = ("short_period", "long_period", "symbol", "volume", "ma_type", "signal_bars", "_bars_seen",
+                 "_sid", "short_ma", "long_ma",
+                 "min_signal_interval", "_cross_side", "_pending_direction", "_signal_handle",
+                 "_next_signal_time", "_order_tasks")
+
     def __init__(self, config: Dict[str, Any] = None):
         super().__init__("DoubleMaStrategy", config)
         self.short_period = self.config.get("short_period", 30)
         self.long_period = self.config.get("long_period", 60)
         self.symbol = self.config.get("symbol", "SHFE.bu2012")
         self.volume = self.config.get("volume", 1)
+        # 均线类型："SMA"（简单移动平均）或 "EMA"（指数移动平均）
+        self.ma_type = self.config.get("ma_type", "SMA")
+        # 收到足够计算长周期均线的行情数后即认为策略已可验证
+        self.signal_bars = self.config.get("signal_bars", self.long_period)
+        self._bars_seen = 0
 
-    async def on_market_data(self, symbol: str, quote_data: Any):
+        # 均线状态：价格窗口存放在共享的 QUOTE_BOOK 中，这里只保留当前均线值，每笔行情O(1)更新
+        # 周期等于缓冲区长度时，移出窗口的旧价格所在位置正好被刚写入的新价格覆盖
+        if self.long_period >= QuoteBook.RING_LEN:
+            raise ValueError(f"长周期 {self.long_period} 必须小于价格缓冲区长度 {QuoteBook.RING_LEN}")
+        self._sid = QUOTE_BOOK.register(self.symbol)
+        self.short_ma = 0.0
+        self.long_ma = 0.0
+
+        # 信号处理：均线交叉时通过 loop.call_later 安排一次下单，
+        # 两次信号处理之间至少间隔 min_signal_interval 秒，期间的交叉只保留最新方向
+        self.min_signal_interval = self.config.get("min_signal_interval", 0.05)
+        self._cross_side = 0  # 短均线相对长均线的位置：1在上方，-1在下方，0未知
+        self._pending_direction: Optional[str] = None
+        self._signal_handle: Optional[asyncio.TimerHandle] = None
+        self._next_signal_time = 0.0
+        self._order_tasks = set()
+
+    def on_market_data(self, symbol: str, quote_data: Any):
         """行情数据回调 - 实现双均线逻辑"""
         if not self.is_running or symbol != self.symbol:
             return
 
-        # 简化的双均线逻辑
-        try:
-            # 这里应该计算MA值，但为简化测试，直接模拟
-            if hasattr(quote_data, 'close'):
-                # 模拟交易信号
-                await self._check_trading_signal()
-        except Exception as e:
-            self._log(f"处理行情数据时出错: {e}", level="ERROR")
+        # 均线更新路径不做异常保护（出错时由数据管理器的分发逻辑记录），只保护下单部分
+        # 盘中 close 为 NaN（收盘后才有值），使用最新价；最新价为 NaN 的行情直接跳过，
+        # 均线内核以 fastmath 编译，NaN 参与计算的结果未定义
+        price = getattr(quote_data, 'last_price', None)
+        if price is None or math.isnan(price):
+            return
+        self._update_ma(price)
+        self._bars_seen += 1
+        if self._bars_seen >= self.signal_bars:
+            self._signal_event.set()
+        if self._bars_seen >= self.long_period:
+            self._detect_cross()
 
-    async def on_order_update(self, order_data: Any):
+    def _update_ma(self, price: float):
+        """用最新价格更新短、长周期均线（样本数达到周期长度后均线才有效）"""
+        book, sid = QUOTE_BOOK, self._sid
+        pos = book.push(sid, price, dispatched=True)
+        n = self._bars_seen
+        if self.ma_type == "EMA":
+            if n == 0:
+                self.short_ma = self.long_ma = price
+            else:
+                self.short_ma = _ema_update(self.short_ma, price, 2.0 / (self.short_period + 1))
+                self.long_ma = _ema_update(self.long_ma, price, 2.0 / (self.long_period + 1))
+            return
+
+        # 移出窗口的旧价格：本策略收到的价格数不足一个周期时视为0（均线尚在累加）
+        short_period, long_period = self.short_period, self.long_period
+        old_short = book.price_at(sid, pos - short_period) if n >= short_period else 0.0
+        old_long = book.price_at(sid, pos - long_period) if n >= long_period else 0.0
+        self.short_ma = _sma_update(self.short_ma, price, old_short, short_period)
+        self.long_ma = _sma_update(self.long_ma, price, old_long, long_period)
+
+    def _detect_cross(self):
+        """判断均线是否交叉：上穿产生买入信号，下穿产生卖出信号，并唤醒信号处理任务"""
+        diff = self.short_ma - self.long_ma
+        side = 1 if diff > 0 else -1 if diff < 0 else 0
+        if side == 0 or side == self._cross_side:
+            return
+        previous, self._cross_side = self._cross_side, side
+        if previous != 0:
+            self._pending_direction = _BUY if side > 0 else _SELL
+            if self._signal_handle is None:
+                loop = self._loop
+                delay = max(0.0, self._next_signal_time - loop.time())
+                self._signal_handle = loop.call_later(delay, self._fire_signal)
+
+    def _fire_signal(self):
+        """定时回调：取出最新的信号方向并创建下单任务"""
+        self._signal_handle = None
+        direction, self._pending_direction = self._pending_direction, None
+        if direction is None or not self.is_running:
+            return
+        self._next_signal_time = self._loop.time() + self.min_signal_interval
+        task = self._loop.create_task(self._check_trading_signal(direction))
+        self._order_tasks.add(task)
+        task.add_done_callback(self._order_tasks.discard)
+
+    def on_order_update(self, order_data: Any):
         """订单更新回调"""
         if order_data.status == "FINISHED":
             self.orders_created += 1
             self._log(f"订单完成: {order_data.order_id}")
 
-    async def on_trade_update(self, trade_data: Any):
+    def on_trade_update(self, trade_data: Any):
         """成交更新回调"""
         self.trades_executed += 1
+        self._signal_event.set()
         self._log(f"成交更新: {trade_data.trade_id}")
 
-    async def _check_trading_signal(self):
-        """检查交易信号 - 简化版本"""
-        # 模拟交易逻辑：每5次调用产生一次信号
-        if self.orders_created % 5 == 0 and self.orders_created < 10:
-            direction = "BUY" if self.orders_created % 2 == 0 else "SELL"
-            await self.place_order(self.symbol, direction, self.volume)
-            self._log(f"产生交易信号: {self.symbol} {direction} {self.volume}手")
+    def _reverse_orders(self, direction: str) -> List[Tuple[str, int]]:
+        """
+        按信号方向反手：先平掉反方向的可平持仓（上期所/上期能源区分平今、平昨），再开仓 volume 手
+
+        Returns:
+            List[Tuple[str, int]]: 按提交顺序排列的 (开平标志, 手数)
+        """
+        orders = []
+        get_position = getattr(self.data_manager, "get_tq_position", None)
+        position = get_position(self.symbol) if get_position is not None else None
+        if position is not None:
+            side = "short" if direction is _BUY else "long"
+            today = getattr(position, f"pos_{side}_today") - getattr(position, f"volume_{side}_frozen_today")
+            his = getattr(position, f"pos_{side}_his") - getattr(position, f"volume_{side}_frozen_his")
+            if self.symbol.split(".", 1)[0] in _CLOSETODAY_EXCHANGES:
+                if today > 0:
+                    orders.append((_CLOSETODAY, today))
+                if his > 0:
+                    orders.append((_CLOSE, his))
+            elif today + his > 0:
+                orders.append((_CLOSE, today + his))
+        orders.append((_OPEN, self.volume))
+        return orders
+
+    async def _check_trading_signal(self, direction: str):
+        """按均线交叉方向反手下单"""
+        try:
+            for offset, volume in self._reverse_orders(direction):
+                await self.place_order(self.symbol, direction, volume, offset=offset)
+                self._log(f"产生交易信号: {self.symbol} {direction} {offset} {volume}手")
+            if self._order_queue:
+                # 本笔行情产生的全部信号一次性提交
+                await self.flush_orders()
+        except Exception as e:
+            self._log(f"处理交易信号时出错: {e}", level=logging.ERROR)
 
     async def on_start(self):
         """策略启动自定义逻辑"""
         self._log(f"双均线策略启动: 短周期{self.short_period}, 长周期{self.long_period}")
+        self.warm_up(self.config.get("history_closes"))
+
+    def warm_up(self, closes: Optional[Any] = None) -> bool:
+        """
+        用历史收盘价预热均线，之后的实时行情直接走增量更新
+
+        closes 只在该合约的价格缓冲区为空时写入（NaN 会被剔除）；缓冲区中已有其他策略写入的价格时直接使用。
+        EMA模式按惯例以同周期SMA作为初始值。
+
+        Returns:
+            bool: 价格数量达到长周期、完成预热时返回True
+        """
+        book, sid = QUOTE_BOOK, self._sid
+        if closes is not None and int(book.write_idx[sid]) == 0:
+            closes = np.asarray(closes, dtype=np.float64)
+            # K线序列开头常有尚无数据的NaN行：NaN经累加和会传染到之后所有均线值，
+            # 并留在共享缓冲区中影响同合约的其他策略，写入前剔除
+            for price in closes[~np.isnan(closes)][-QuoteBook.RING_LEN:]:
+                book.push(sid, price)
+
+        prices = book.recent(sid, QuoteBook.RING_LEN)
+        if len(prices) < self.long_period:
+            return False
+
+        short_series = _backfill_sma(prices, self.short_period)
+        long_series = _backfill_sma(prices, self.long_period)
+        self.short_ma = float(short_series[-1])
+        self.long_ma = float(long_series[-1])
+        self._bars_seen = self.long_period
+        diff = self.short_ma - self.long_ma
+        self._cross_side = 1 if diff > 0 else -1 if diff < 0 else 0
+        self._log(f"均线预热完成: 使用{len(prices)}条历史价格")
+        return True
 
     async def on_stop(self):
         """策略停止自定义逻辑"""
+        if self._signal_handle is not None:
+            self._signal_handle.cancel()
+            self._signal_handle = None
+        self._pending_direction = None
+        if self._order_tasks:
+            # 等待已发出的下单请求完成
+            await asyncio.gather(*self._order_tasks, return_exceptions=True)
         self._log(f"双均线策略停止，共创建{self.orders_created}个订单")
 
+# 策略名称 -> 策略类，模块加载时建立一次
+_STRATEGY_MAP: Dict[str, type] = {
+    "double_ma": DoubleMaStrategy,
+}
+
+
 # 策略工厂函数
 def create_strategy(strategy_name: str, config: Dict[str, Any] = None) -> BaseTradingStrategy:
-    """创建策略实例"""
-    strategy_map = {
-        "double_ma": DoubleMaStrategy,
-    }
-    
-    strategy_class = strategy_map.get(strategy_name, DoubleMaStrategy)
-    return strategy_class(config)
+    """创建策略实例（未知的策略名称使用双均线策略）"""
+    return _STRATEGY_MAP.get(strategy_name, DoubleMaStrategy)(config)
 
 # 策略配置
 STRATEGY_CONFIGS = {
@@ -162,5 +525,6 @@ if __name__ == "__main__":
         await strategy.start()
         await asyncio.sleep(1)
         await strategy.stop()
-    
+
+    install_uvloop()
     asyncio.run(test_strategy())